@@ -1,4 +1,5 @@
 import os
+import atexit
 import tempfile
 import shutil
 import json as py_json
@@ -7,18 +8,50 @@ import subprocess
 import threading
 import queue
 import time
+import functools
+import hashlib
 import logging
+from logging.handlers import QueueHandler, QueueListener
 import pty
+import py_compile
 import select
 import termios
 import fcntl
+import heapq
 import random
+import re
+import signal
 import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice, zip_longest
 from werkzeug.utils import secure_filename
 from flask import Flask, render_template, request, jsonify, Response
+from flask.json.provider import JSONProvider
 from flask_socketio import SocketIO, emit
 from dotenv import load_dotenv
 
+# orjson is a C-backed JSON parser; fall back to stdlib json when it
+# isn't installed (dev environments)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import eventlet
+    from eventlet import tpool
+except ImportError:
+    eventlet = tpool = None
+
+# Optional: shared metadata store for multi-worker deployments
+try:
+    import redis
+except ImportError:
+    redis = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 # Load environment variables
 load_dotenv()
 
@@ -29,25 +62,54 @@ try:
 except:
     log_handler = logging.StreamHandler()
 
+# Route all records through a queue so handler I/O (stream and file
+# writes) happens on a single background listener thread instead of the
+# request-serving threads
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(_log_formatter)
+log_handler.setFormatter(_log_formatter)
+
+_log_queue = queue.Queue(-1)
+_log_listener = QueueListener(_log_queue, _stream_handler, log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# Verbose logging only outside production; DEBUG-level records in the
+# upload and terminal loops are filtered before formatting
+_LOG_LEVEL = logging.DEBUG if os.environ.get('FLASK_ENV') == 'development' else logging.INFO
+
 logging.basicConfig(
-    level=logging.DEBUG,  # Changed to DEBUG for more verbose logging
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        log_handler
-    ]
+    level=_LOG_LEVEL,
+    handlers=[QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
 # Add early startup logging
 logger.info("Starting Flask application initialization...")
-logger.info(f"Python path: {os.getcwd()}")
-logger.info(f"Environment variables: PORT={os.environ.get('PORT')}, HOST={os.environ.get('HOST')}")
+logger.info("Python path: %s", os.getcwd())
+logger.info("Environment variables: PORT=%s, HOST=%s", os.environ.get('PORT'), os.environ.get('HOST'))
 
 app = Flask(__name__)
-socketio = SocketIO(app, 
+
+# Route jsonify through orjson when available; the debug endpoints
+# return multi-kilobyte nested dicts that the C encoder serializes
+# several times faster than the stdlib one
+if orjson is not None:
+    class _OrjsonProvider(JSONProvider):
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = _OrjsonProvider(app)
+
+socketio = SocketIO(app,
                    cors_allowed_origins="*",
-                   logger=True,
+                   # Per-packet SocketIO logging only when debugging;
+                   # in production it costs a log record per frame
+                   logger=_LOG_LEVEL <= logging.DEBUG,
                    engineio_logger=False,
                    async_mode='eventlet',  # Explicitly use eventlet for async support
                    ping_timeout=60,
@@ -63,6 +125,23 @@ PORT = int(os.environ.get('PORT', 8080))  # Cloud Run sets PORT automatically
 HOST = os.environ.get('HOST', '0.0.0.0')
 DEBUG = os.environ.get('FLASK_ENV') == 'development'
 
+# Invariant paths, resolved once at import so hot handlers touch plain
+# strings instead of redoing os.path work per request
+_HERE = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(_HERE, 'backend')
+NLP_TOOLBOX_DIR = os.path.join(BACKEND_DIR, 'NLPAgentsToolbox')
+TOOLS_DIR = os.path.join(NLP_TOOLBOX_DIR, 'tools')
+MKBIO_SCRIPT = os.path.join(TOOLS_DIR, 'mkbio.py')
+LSBIO_SCRIPT = os.path.join(TOOLS_DIR, 'lsbio.py')
+BUILD_DIR = os.path.join(NLP_TOOLBOX_DIR, 'build')
+JUROR_DB = os.path.join(BUILD_DIR, 'juror.db')
+
+# Docker container Python used for the NLPAgentsToolbox scripts; its
+# existence never changes at runtime, so check once at import instead
+# of per generation event
+SYSTEM_PYTHON = '/usr/local/bin/python3'
+_SYSTEM_PYTHON_OK = os.path.exists(SYSTEM_PYTHON)
+
 # Create temporary directory for uploads
 TEMP_DIR = tempfile.mkdtemp(prefix="jury_uploads_")
 JUROR_DIR = os.path.join(TEMP_DIR, "jurors")
@@ -72,12 +151,84 @@ CASE_DIR = os.path.join(TEMP_DIR, "cases")
 os.makedirs(JUROR_DIR, exist_ok=True)
 os.makedirs(CASE_DIR, exist_ok=True)
 
+# Precomputed prefixes so hot upload loops build paths by plain string
+# concatenation; sanitized filenames contain no separators
+_JUROR_PREFIX = JUROR_DIR + os.sep
+_CASE_PREFIX = CASE_DIR + os.sep
+
+# Directory fds opened once at startup; per-request unlinks go through
+# dir_fd so they skip re-resolving the directory path each time
+_DIR_FDS = {
+    JUROR_DIR: os.open(JUROR_DIR, os.O_DIRECTORY),
+    CASE_DIR: os.open(CASE_DIR, os.O_DIRECTORY),
+}
+
+def _close_dir_fds():
+    for fd in _DIR_FDS.values():
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+atexit.register(_close_dir_fds)
+
 print(f"Upload directory: {TEMP_DIR}")
-logger.info(f"Upload directory: {TEMP_DIR}")
+logger.info("Upload directory: %s", TEMP_DIR)
+
+def _cleanup_temp_dir():
+    """Remove the upload temp dir; registered with atexit so it runs
+    under gunicorn and Ctrl-C, not just the __main__ try/finally path."""
+    shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+atexit.register(_cleanup_temp_dir)
+
+def _sigterm_cleanup(signum, frame):
+    """Start temp-dir removal in the background on SIGTERM.
+
+    Cloud Run gives a short grace period after SIGTERM; running the
+    rmtree on a daemon thread means a slow filesystem can't hold the
+    process past it. Chains to whatever handler was installed before us
+    (gunicorn's worker shutdown) so graceful termination still works.
+    """
+    threading.Thread(target=shutil.rmtree, args=(TEMP_DIR,),
+                     kwargs={'ignore_errors': True}, daemon=True).start()
+    if callable(_prev_sigterm):
+        _prev_sigterm(signum, frame)
+    else:
+        raise SystemExit(0)
+
+_prev_sigterm = signal.signal(signal.SIGTERM, _sigterm_cleanup)
+
+# Running processes registered for termination. deque append/remove are
+# atomic under the GIL, so registration needs no lock; /stop_process
+# works from a list() snapshot.
+current_running_processes = deque()
 
-# Global variable to track running processes for termination
-current_running_processes = []
-process_lock = threading.Lock()
+# Bounded pool for upload filesystem work: caps concurrent IOPS while
+# letting the clears and saves of one request overlap
+_UPLOAD_POOL = ThreadPoolExecutor(max_workers=8)
+
+if tpool is not None:
+    # Under eventlet monkey-patching the executor's threads are green,
+    # so disk writes in them would still block the hub. Dispatch each
+    # task to eventlet's native thread pool from its own greenthread so
+    # tasks overlap and the hub keeps serving other requests.
+    tpool.set_num_threads(8)
+
+    class _FsTask:
+        """Future-like handle over tpool-executed filesystem work."""
+
+        def __init__(self, fn, *args):
+            self._gt = eventlet.spawn(tpool.execute, fn, *args)
+
+        def result(self):
+            return self._gt.wait()
+
+    def _submit_fs(fn, *args):
+        return _FsTask(fn, *args)
+else:
+    def _submit_fs(fn, *args):
+        return _UPLOAD_POOL.submit(fn, *args)
 
 @app.route("/", methods=["GET"])
 def index():
@@ -85,7 +236,7 @@ def index():
     try:
         return render_template("index.html")
     except Exception as e:
-        logger.error(f"Error serving index page: {e}")
+        logger.error("Error serving index page: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 @app.route("/health", methods=["GET"])
@@ -93,54 +244,212 @@ def health_check():
     """Health check endpoint for container orchestration"""
     return "OK", 200
 
+# Orchestrators poll /health every few seconds; answer it straight from
+# the WSGI layer so those requests skip SocketIO's middleware and
+# Flask's routing/response machinery entirely. The route above stays as
+# documentation and as the handler for any non-GET probes.
+_HEALTH_WSGI_RESP = [b'OK']
+_HEALTH_HEADERS = [('Content-Type', 'text/plain'), ('Content-Length', '2')]
+_wrapped_wsgi_app = app.wsgi_app
+
+def _wsgi_with_health_shortcut(environ, start_response):
+    if environ.get('PATH_INFO') == '/health' and environ.get('REQUEST_METHOD') == 'GET':
+        start_response('200 OK', _HEALTH_HEADERS)
+        return _HEALTH_WSGI_RESP
+    return _wrapped_wsgi_app(environ, start_response)
+
+app.wsgi_app = _wsgi_with_health_shortcut
+
+class _DropHealthAccessLogs(logging.Filter):
+    """Keep /health polls out of the dev-server access log."""
+
+    def filter(self, record):
+        return '/health' not in record.getMessage()
+
+logging.getLogger('werkzeug').addFilter(_DropHealthAccessLogs())
+
+# Characters stripped from ASCII filenames by the safe_name fast path
+_UNSAFE_CHARS = re.compile(r'[^A-Za-z0-9._-]+')
+
+def safe_name(filename):
+    """Sanitize an upload filename.
+
+    ASCII names (the common case) are cleaned with one precompiled regex
+    substitution; anything else falls back to werkzeug's secure_filename,
+    whose Unicode normalization is the expensive part.
+    """
+    if filename.isascii():
+        return _UNSAFE_CHARS.sub('_', filename).strip('._')[:255] or 'unnamed'
+    return secure_filename(filename)
+
+def _to_int(value, default=100):
+    """Parse a form weight, falling back to the default on bad input."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+def _real_file_fd(stream):
+    """Return the fd of a stream already backed by a real file, else None.
+
+    Spooled uploads that are still in memory are left alone: calling
+    fileno() on them would force a rollover to disk just to read back.
+    """
+    if isinstance(stream, tempfile.SpooledTemporaryFile) and not stream._rolled:
+        return None
+    try:
+        return stream.fileno()
+    except (AttributeError, OSError):
+        return None
+
+def _save_upload(stream, filepath):
+    """Write an uploaded stream to its final path.
+
+    Uploads that werkzeug has already spooled to a real temp file are
+    moved with os.sendfile, keeping the bytes in the kernel; in-memory
+    streams fall back to a 1 MiB chunked copy.
+    """
+    with open(filepath, 'wb', buffering=0) as dst:
+        src_fd = _real_file_fd(stream)
+        if src_fd is not None:
+            size = os.fstat(src_fd).st_size
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(dst.fileno(), src_fd, offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        else:
+            shutil.copyfileobj(stream, dst, length=1024 * 1024)
+
+def _fast_move(src, dst):
+    """Move a file, preferring an atomic same-filesystem rename.
+
+    Falls back to an in-kernel sendfile copy plus unlink when source
+    and destination live on different filesystems (TEMP_DIR may be a
+    different mount than the toolbox build directory).
+    """
+    try:
+        os.rename(src, dst)
+        return
+    except OSError:
+        pass  # cross-device
+    with open(src, 'rb') as sf, open(dst, 'wb') as df:
+        size = os.fstat(sf.fileno()).st_size
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(df.fileno(), sf.fileno(), offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+    shutil.copystat(src, dst)
+    os.unlink(src)
+
+# Directory listings keyed on mtime_ns, so repeated /run and
+# /run_notebook calls between uploads don't re-scan the upload dirs
+_DIR_LIST_CACHE = {}
+
+def _list_files(directory):
+    """Names of regular files in a directory (empty list if missing).
+
+    Results are cached per directory and invalidated by the directory's
+    mtime, which every upload/delete in it bumps.
+    """
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+    except FileNotFoundError:
+        return []
+    cached = _DIR_LIST_CACHE.get(directory)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with os.scandir(directory) as it:
+        names = [e.name for e in it if e.is_file(follow_symlinks=False)]
+    _DIR_LIST_CACHE[directory] = (mtime, names)
+    return names
+
+def clear_directory(directory, preserved):
+    """Remove regular files from a directory, keeping names in preserved.
+
+    Uses os.scandir plus unlinks against the directory fd opened at
+    startup, so each entry costs a single syscall instead of a stat and
+    a fully path-resolved remove. Returns (deleted_names, kept_names).
+    """
+    deleted = []
+    kept = []
+    dfd = _DIR_FDS.get(directory)
+    try:
+        with os.scandir(directory) as it:
+            if not preserved:
+                # Common case: nothing to keep, so skip the per-entry
+                # membership test and just unlink every regular file
+                for entry in it:
+                    if entry.is_file(follow_symlinks=False):
+                        if dfd is not None:
+                            os.unlink(entry.name, dir_fd=dfd)
+                        else:
+                            os.unlink(entry.path)
+                        deleted.append(entry.name)
+            else:
+                for entry in it:
+                    if entry.name in preserved:
+                        kept.append(entry.name)
+                    elif entry.is_file(follow_symlinks=False):
+                        if dfd is not None:
+                            os.unlink(entry.name, dir_fd=dfd)
+                        else:
+                            os.unlink(entry.path)
+                        deleted.append(entry.name)
+    except FileNotFoundError:
+        pass
+    if deleted:
+        _DIR_LIST_CACHE.pop(directory, None)
+    return deleted, kept
+
 @app.route("/upload", methods=["POST"])
 def upload_files():
     try:
+        # Reject oversized requests up front, before any body parsing
+        content_length = request.content_length
+        if content_length and content_length > app.config['MAX_CONTENT_LENGTH']:
+            return jsonify({'error': 'Request too large'}), 413
+
         # Get additional data about categories and weights
         categories = request.form.getlist('categories')
         weights = request.form.getlist('weights')
         all_files_metadata_str = request.form.get('allFilesMetadata', '[]')
-        
+
         try:
-            all_files_metadata = json.loads(all_files_metadata_str)
+            all_files_metadata = _json_loads(all_files_metadata_str)
         except:
             all_files_metadata = []
         
         # Clear existing files first, but preserve generated files that are still referenced
         logger.info("Clearing existing files...")
         
-        # Get list of generated files that should be preserved
-        preserved_generated_files = [f['name'] for f in all_files_metadata if f.get('generated', False)]
-        logger.info(f"Preserving generated files: {preserved_generated_files}")
+        # Get the set of generated files that should be preserved
+        # (frozenset: membership is tested once per directory entry)
+        preserved_generated_files = frozenset(
+            f['name'] for f in all_files_metadata if f.get('generated', False))
+        logger.info("Preserving generated files: %s", sorted(preserved_generated_files))
         
         # Clear file metadata for non-preserved files
-        current_metadata = get_all_file_metadata()
-        for filename in list(current_metadata.keys()):
-            if filename not in preserved_generated_files:
-                FILE_METADATA.pop(filename, None)
-        
-        # Clear juror directory (except preserved generated files)
-        if os.path.exists(JUROR_DIR):
-            for filename in os.listdir(JUROR_DIR):
-                if filename not in preserved_generated_files:
-                    filepath = os.path.join(JUROR_DIR, filename)
-                    if os.path.isfile(filepath):
-                        os.remove(filepath)
-                        logger.info(f"Deleted: {filepath}")
-                else:
-                    logger.info(f"Preserved generated file: {filename}")
-        
-        # Clear case directory (except preserved generated files)
-        if os.path.exists(CASE_DIR):
-            for filename in os.listdir(CASE_DIR):
-                if filename not in preserved_generated_files:
-                    filepath = os.path.join(CASE_DIR, filename)
-                    if os.path.isfile(filepath):
-                        os.remove(filepath)
-                        logger.info(f"Deleted: {filepath}")
-                else:
-                    logger.info(f"Preserved generated file: {filename}")
+        prune_file_metadata(preserved_generated_files)
         
+        # Clear juror and case directories (except preserved generated
+        # files); both clears run on the pool so their unlinks overlap
+        clear_futures = [
+            (directory, _submit_fs(clear_directory, directory, preserved_generated_files))
+            for directory in (JUROR_DIR, CASE_DIR)
+        ]
+        for directory, future in clear_futures:
+            deleted, kept = future.result()
+            if deleted:
+                logger.info("Deleted %d files from %s", len(deleted), directory)
+                logger.debug("Deleted from %s: %s", directory, deleted)
+            if kept:
+                logger.info("Preserved %d generated files in %s", len(kept), directory)
+                logger.debug("Preserved in %s: %s", directory, kept)
+
         logger.info("All existing files cleared (except preserved generated files).")
         
         # Check if the request contains files
@@ -152,28 +461,33 @@ def upload_files():
             if file.filename:
                 ext = os.path.splitext(file.filename)[1].lower()
                 if ext not in allowed_extensions:
-                    logger.warning(f"Rejected file with invalid extension: {file.filename}")
+                    logger.warning("Rejected file with invalid extension: %s", file.filename)
                     return jsonify({'error': f'Invalid file type: {ext}. Only .yaml, .yml, and .txt files are allowed.'}), 400
         
         results = []
-        
-        for i, file in enumerate(files):
-            if file.filename != '':
-                filename = secure_filename(file.filename)
-                category = categories[i] if i < len(categories) else 'juror'
-                weight = int(weights[i]) if i < len(weights) and weights[i].isdigit() else 100
-                
-                # Determine target directory
-                target_dir = JUROR_DIR if category == 'juror' else CASE_DIR
-                
-                # Save the actual file
-                filepath = os.path.join(target_dir, filename)
-                file.save(filepath)
-                
+        save_futures = []
+
+        # Convert weights to ints once up front instead of re-inspecting
+        # the strings on every iteration
+        parsed_weights = list(map(_to_int, weights))
+
+        for file, category, weight in zip_longest(files, categories, parsed_weights):
+            if file is not None and file.filename != '':
+                filename = safe_name(file.filename)
+                category = category or 'juror'
+                if weight is None:
+                    weight = 100
+
+                # Stream the upload straight to its final path; the writes
+                # are dispatched to the bounded pool so saves within one
+                # request overlap
+                filepath = (_JUROR_PREFIX if category == 'juror' else _CASE_PREFIX) + filename
+                save_futures.append(_submit_fs(_save_upload, file.stream, filepath))
+
                 # Store file metadata
                 store_file_metadata(filename, category, weight)
-                
-                logger.info(f"Uploaded: {filepath} (category: {category}, weight: {weight})")
+
+                logger.debug("Uploaded: %s (category: %s, weight: %s)", filepath, category, weight)
                 
                 results.append({
                     'filename': filename,
@@ -183,6 +497,19 @@ def upload_files():
                     'status': 'uploaded'
                 })
         
+        # Wait for all disk writes to finish (and surface any failure)
+        # before reporting success
+        for future in save_futures:
+            future.result()
+
+        # New files on disk: drop the cached listings
+        _DIR_LIST_CACHE.pop(JUROR_DIR, None)
+        _DIR_LIST_CACHE.pop(CASE_DIR, None)
+
+        # Everything in results so far came from the upload loop;
+        # whatever the next loop appends is preserved-generated
+        uploaded_count = len(results)
+
         # Add preserved generated files to results
         for file_metadata in all_files_metadata:
             if file_metadata.get('generated', False):
@@ -190,8 +517,7 @@ def upload_files():
                 category = file_metadata['category']
                 
                 # Check if file exists in the appropriate directory
-                target_dir = JUROR_DIR if category == 'juror' else CASE_DIR
-                filepath = os.path.join(target_dir, filename)
+                filepath = (_JUROR_PREFIX if category == 'juror' else _CASE_PREFIX) + filename
                 
                 if os.path.exists(filepath):
                     # Store metadata for preserved generated files
@@ -204,12 +530,10 @@ def upload_files():
                         'path': filepath,
                         'status': 'preserved_generated'
                     })
-                    logger.info(f"Preserved generated file: {filepath} (category: {category})")
-        
-        total_files = len(results)
-        uploaded_count = len([r for r in results if r['status'] == 'uploaded'])
-        preserved_count = len([r for r in results if r['status'] == 'preserved_generated'])
+                    logger.debug("Preserved generated file: %s (category: %s)", filepath, category)
         
+        preserved_count = len(results) - uploaded_count
+
         message = f'Uploaded {uploaded_count} new files'
         if preserved_count > 0:
             message += f' and preserved {preserved_count} generated files'
@@ -222,7 +546,7 @@ def upload_files():
         })
         
     except Exception as e:
-        logger.error(f"Upload error: {str(e)}")
+        logger.error("Upload error: %s", str(e))
         return jsonify({'error': 'Internal server error'}), 500
 
 @app.route("/run", methods=["POST"])
@@ -236,8 +560,8 @@ def run_process():
         evaluation_options = data.get('evaluation_options', [])
         
         # List uploaded files
-        juror_files = os.listdir(JUROR_DIR) if os.path.exists(JUROR_DIR) else []
-        case_files = os.listdir(CASE_DIR) if os.path.exists(CASE_DIR) else []
+        juror_files = _list_files(JUROR_DIR)
+        case_files = _list_files(CASE_DIR)
         
         # Check if we have required files
         if not juror_files:
@@ -269,33 +593,221 @@ def run_process():
 def stop_process():
     """Stop the currently running notebook execution"""
     try:
-        with process_lock:
-            if current_running_processes:
-                logger.info(f"Stopping {len(current_running_processes)} running processes")
-                for process in current_running_processes:
+        # Work from an atomic snapshot; processes registered after it
+        # belong to newer runs and are left alone
+        processes = list(current_running_processes)
+        if not processes:
+            return jsonify({'success': True, 'message': 'No processes running'})
+
+        logger.info("Stopping %s running processes", len(processes))
+        for process in processes:
+            try:
+                if process.poll() is None:  # Process is still running
+                    process.terminate()
+                    # Give it a moment to terminate gracefully
                     try:
-                        if process.poll() is None:  # Process is still running
-                            process.terminate()
-                            # Give it a moment to terminate gracefully
-                            try:
-                                process.wait(timeout=3)
-                            except subprocess.TimeoutExpired:
-                                # Force kill if it doesn't terminate gracefully
-                                process.kill()
-                                process.wait()
-                            logger.info(f"Process {process.pid} terminated")
-                    except Exception as e:
-                        logger.error(f"Error terminating process: {e}")
-                
-                current_running_processes.clear()
-                return jsonify({'success': True, 'message': 'All processes stopped'})
-            else:
-                return jsonify({'success': True, 'message': 'No processes running'})
-                
+                        process.wait(timeout=3)
+                    except subprocess.TimeoutExpired:
+                        # Force kill if it doesn't terminate gracefully
+                        process.kill()
+                        process.wait()
+                    logger.info("Process %s terminated", process.pid)
+            except Exception as e:
+                logger.error("Error terminating process: %s", e)
+            try:
+                current_running_processes.remove(process)
+            except ValueError:
+                pass  # already unregistered by its run loop
+
+        return jsonify({'success': True, 'message': 'All processes stopped'})
+
     except Exception as e:
-        logger.error(f"Error stopping processes: {e}")
+        logger.error("Error stopping processes: %s", e)
         return jsonify({'error': str(e)}), 500
 
+# Pre-encoded SSE frame pieces so frames are assembled from cached
+# bytes fragments instead of fresh f-strings encoded per yield
+_SSE_DATA_PREFIX = b'data: '
+_SSE_END = b'\n\n'
+_SSE_OUTPUT_PREFIX = b'data: {"status": "output", "message": '
+_SSE_SUFFIX = b'}\n\n'
+_SSE_KEEPALIVE = b': keepalive\n\n'
+
+# Constant status frames, serialized once at import instead of through
+# json.dumps on every generation request
+_SSE_MKBIO_OK = b'data: {"status": "output", "message": "mkbio.py completed successfully"}\n\n'
+_SSE_RUNNING_LSBIO = b'data: {"status": "output", "message": "Running lsbio.py -e..."}\n\n'
+_SSE_LSBIO_OK = b'data: {"status": "output", "message": "lsbio.py completed successfully"}\n\n'
+
+# Shared headers for event-stream responses. Content-Encoding: identity
+# keeps compressing proxies from buffering events, and nosniff stops
+# clients second-guessing the stream's content type.
+_SSE_HEADERS = {
+    'Cache-Control': 'no-cache',
+    'Connection': 'keep-alive',
+    'Access-Control-Allow-Origin': '*',
+    'X-Accel-Buffering': 'no',
+    'Content-Encoding': 'identity',
+    'X-Content-Type-Options': 'nosniff'
+}
+
+if orjson is not None:
+    _json_bytes = orjson.dumps
+else:
+    def _json_bytes(obj):
+        return json.dumps(obj).encode()
+
+def sse_output(message):
+    """Build an SSE 'output' frame, JSON-escaping only the message."""
+    return _SSE_OUTPUT_PREFIX + _json_bytes(message) + _SSE_SUFFIX
+
+def sse_event(status, message, **extra):
+    """Build an SSE frame for any status as bytes."""
+    payload = {'status': status, 'message': message}
+    if extra:
+        payload.update(extra)
+    return _SSE_DATA_PREFIX + _json_bytes(payload) + _SSE_END
+
+# Cache key of the last notebook -> Python extraction, so repeated
+# /run_notebook calls skip re-parsing an unchanged notebook
+_NB_CACHE = {}
+
+# Lines to drop from notebook cells: shell commands and blanks
+_NB_SKIP_LINE = re.compile(r'^\s*(?:!.*)?$')
+
+def extract_notebook_functions(backend_dir):
+    """Extract Python code from the deliberation notebook into a .py file.
+
+    Returns the path of the generated file. The JSON parse and rewrite
+    are skipped when the notebook is unchanged since the last extraction,
+    keyed on the notebook file's (mtime_ns, size).
+    """
+    notebook_path = os.path.join(backend_dir, 'langgraph_jury_deliberation.ipynb')
+    notebook_functions_file = os.path.join(backend_dir, 'run_notebook_functions.py')
+
+    st = os.stat(notebook_path)
+    cache_key = (st.st_mtime_ns, st.st_size)
+    if _NB_CACHE.get('key') == cache_key and os.path.exists(notebook_functions_file):
+        return notebook_functions_file
+
+    # Cold-start fast path: trust an on-disk extraction at least as new
+    # as the notebook (e.g. produced at container build time)
+    try:
+        if os.path.getmtime(notebook_functions_file) >= st.st_mtime:
+            _NB_CACHE['key'] = cache_key
+            return notebook_functions_file
+    except OSError:
+        pass
+
+    # Extract Python code from the notebook
+    with open(notebook_path, 'rb') as f:
+        raw = f.read()
+    notebook = _json_loads(raw)
+
+    skip_line = _NB_SKIP_LINE.match
+    python_code = []
+    for cell in notebook['cells']:
+        if cell['cell_type'] == 'code':
+            cell_source = ''.join(cell['source'])
+            # Skip shell commands (starting with !) and empty lines
+            filtered_lines = [line for line in cell_source.split('\n')
+                              if not skip_line(line)]
+            if filtered_lines:  # Only add if there's actual Python code
+                python_code.append('\n'.join(filtered_lines))
+
+    new_source = '\n\n'.join(python_code)
+
+    # Skip the rewrite (and the bytecode invalidation it causes) when a
+    # touched notebook still extracts to identical code
+    try:
+        with open(notebook_functions_file, 'r') as f:
+            unchanged = f.read() == new_source
+    except OSError:
+        unchanged = False
+
+    if not unchanged:
+        # Write extracted code atomically so a concurrent run never
+        # reads a partially written module
+        tmp_path = notebook_functions_file + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(new_source)
+        os.replace(tmp_path, notebook_functions_file)
+
+        # Precompile so the runner's import picks up cached bytecode
+        # instead of re-parsing the extracted source on every run
+        try:
+            py_compile.compile(notebook_functions_file, doraise=True)
+        except py_compile.PyCompileError as e:
+            logger.warning("Extracted notebook code failed to precompile: %s", e)
+
+    _NB_CACHE['key'] = cache_key
+    return notebook_functions_file
+
+# Marker the worker prints after each run so the streaming side knows
+# where one run's output ends and whether it succeeded
+_RUN_DONE_MARKER = '__RUN_DONE__'
+
+# Persistent worker: reads one JSON command per line from stdin and runs
+# a deliberation for each. The interpreter startup and the heavyweight
+# notebook imports are paid once per /run_notebook request instead of
+# once per run.
+RUNNER_SCRIPT = '''\
+import json
+import sys
+import traceback
+
+# Import the extracted notebook code once; every run served by this
+# worker reuses the loaded modules
+print("Loading notebook...")
+import run_notebook_functions as _nb
+globals().update(vars(_nb))
+
+for _line in sys.stdin:
+    _line = _line.strip()
+    if not _line:
+        continue
+    _cmd = json.loads(_line)
+    jury_file = _cmd['jury_file']
+    case_file = _cmd['case_file']
+    run_number = _cmd['run_number']
+
+    print(f"Run {run_number}: Using jury file: {jury_file}")
+    print(f"Run {run_number}: Using case file: {case_file}")
+
+    try:
+        print("Starting deliberation...")
+        # Call run_deliberation with uploaded files from temp directories
+        run_deliberation(
+            jury_file=jury_file,
+            case_file=case_file,
+            scenario_number=1,
+            total_rounds=1,  # Each pair runs once
+            save_to_file=True
+        )
+        print(f"Run {run_number} completed successfully!")
+        _status = 'ok'
+    except Exception as e:
+        print(f"Error during deliberation run {run_number}: {e}")
+        traceback.print_exc()
+        _status = 'error'
+
+    print(f"__RUN_DONE__ {run_number} {_status}")
+    sys.stdout.flush()
+'''
+
+def write_runner_script(backend_dir):
+    """Write the shared deliberation runner script if missing or stale."""
+    runner_file = os.path.join(backend_dir, 'run_deliberation_runner.py')
+    try:
+        with open(runner_file, 'r') as f:
+            if f.read() == RUNNER_SCRIPT:
+                return runner_file
+    except OSError:
+        pass
+    with open(runner_file, 'w') as f:
+        f.write(RUNNER_SCRIPT)
+    return runner_file
+
 @app.route("/run_notebook", methods=["GET"])
 def run_notebook():
     """Execute the Jupyter notebook with uploaded files and stream results"""
@@ -310,40 +822,34 @@ def run_notebook():
         case_files_info = []
         
         # Read juror files with metadata
-        if os.path.exists(JUROR_DIR):
-            for filename in os.listdir(JUROR_DIR):
-                filepath = os.path.join(JUROR_DIR, filename)
-                if os.path.isfile(filepath):
-                    metadata = get_file_metadata(filename)
-                    if metadata['category'] == 'juror':  # Only include files categorized as juror
-                        juror_files_info.append({
-                            'name': filename,
-                            'path': filepath,
-                            'weight': metadata['weight']
-                        })
-        
+        for filename in _list_files(JUROR_DIR):
+            metadata = get_file_metadata(filename)
+            if metadata['category'] == 'juror':  # Only include files categorized as juror
+                juror_files_info.append({
+                    'name': filename,
+                    'path': _JUROR_PREFIX + filename,
+                    'weight': metadata['weight']
+                })
+
         # Read case files with metadata
-        if os.path.exists(CASE_DIR):
-            for filename in os.listdir(CASE_DIR):
-                filepath = os.path.join(CASE_DIR, filename)
-                if os.path.isfile(filepath):
-                    metadata = get_file_metadata(filename)
-                    if metadata['category'] == 'case':  # Only include files categorized as case
-                        case_files_info.append({
-                            'name': filename,
-                            'path': filepath,
-                            'weight': metadata['weight']
-                        })
+        for filename in _list_files(CASE_DIR):
+            metadata = get_file_metadata(filename)
+            if metadata['category'] == 'case':  # Only include files categorized as case
+                case_files_info.append({
+                    'name': filename,
+                    'path': _CASE_PREFIX + filename,
+                    'weight': metadata['weight']
+                })
         
         # Check if we have required files
         if not juror_files_info:
             def error_gen():
-                yield f"data: {json.dumps({'status': 'error', 'message': 'No juror files uploaded'})}\n\n"
+                yield sse_event('error', 'No juror files uploaded')
             return Response(error_gen(), mimetype='text/event-stream')
             
         if not case_files_info:
             def error_gen():
-                yield f"data: {json.dumps({'status': 'error', 'message': 'No case files uploaded'})}\n\n"
+                yield sse_event('error', 'No case files uploaded')
             return Response(error_gen(), mimetype='text/event-stream')
         
         # Generate the execution pairs based on repeat mode
@@ -364,293 +870,300 @@ def run_notebook():
                 return pairs
             
             else:  # overall mode
-                # Use weights to determine frequency of each file
-                
-                # Create weighted lists
-                weighted_juror_list = []
-                for juror_file in juror_files_info:
-                    weighted_juror_list.extend([juror_file] * juror_file['weight'])
-                
-                weighted_case_list = []
-                for case_file in case_files_info:
-                    weighted_case_list.extend([case_file] * case_file['weight'])
-                
-                # Generate pairs while trying to maintain uniqueness when possible
-                pairs = []
-                used_combinations = set()
-                
-                for run_num in range(1, total_rounds + 1):
-                    # Try to find a unique combination first
-                    attempts = 0
-                    max_attempts = 50
-                    
-                    while attempts < max_attempts:
-                        juror_file = random.choice(weighted_juror_list)
-                        case_file = random.choice(weighted_case_list)
-                        combo_key = (juror_file['name'], case_file['name'])
-                        
-                        if combo_key not in used_combinations:
-                            used_combinations.add(combo_key)
-                            break
-                        attempts += 1
-                    
-                    # If we couldn't find a unique combination, use the last selected pair
-                    pairs.append({
-                        'juror_file': juror_file,
-                        'case_file': case_file,
-                        'run_number': run_num
-                    })
-                
-                return pairs
+                # Weighted sampling over the explicit (juror, case)
+                # product, pair weight = product of file weights.
+                # Efraimidis-Spirakis keys (u ** (1/w)) give a weighted
+                # sample without replacement, so pairs stay unique while
+                # unique pairs remain; only once the product is
+                # exhausted do duplicates get drawn.
+                all_pairs = [(j, c) for j in juror_files_info for c in case_files_info]
+                pair_weights = [j['weight'] * c['weight'] for j, c in all_pairs]
+
+                unique_count = min(total_rounds, len(all_pairs))
+                chosen = [pw[0] for pw in heapq.nlargest(
+                    unique_count, zip(all_pairs, pair_weights),
+                    key=lambda pw: random.random() ** (1.0 / max(pw[1], 1e-9)))]
+                if total_rounds > unique_count:
+                    chosen += random.choices(all_pairs, weights=pair_weights,
+                                             k=total_rounds - unique_count)
+
+                return [{
+                    'juror_file': juror_file,
+                    'case_file': case_file,
+                    'run_number': run_num
+                } for run_num, (juror_file, case_file) in enumerate(chosen, start=1)]
         
         execution_pairs = generate_execution_pairs()
         
         def generate():
             """Generator function to stream notebook execution results"""
             try:
-                # Change to backend directory
-                backend_dir = os.path.join(os.path.dirname(__file__), 'backend')
-                
+                backend_dir = BACKEND_DIR
+
                 total_pairs = len(execution_pairs)
-                yield f"data: {json.dumps({'status': 'started', 'message': f'Starting {total_pairs} deliberation runs in {repeat_mode} mode'})}\n\n"
+                yield sse_event('started', f'Starting {total_pairs} deliberation runs in {repeat_mode} mode')
                 
                 # Log the execution plan
                 if repeat_mode == 'individual':
                     unique_combinations = len(juror_files_info) * len(case_files_info)
-                    yield f"data: {json.dumps({'status': 'output', 'message': f'Running each of {unique_combinations} unique juror-case combinations {total_rounds} times ({total_pairs} total runs)'})}\n\n"
+                    yield sse_event('output', f'Running each of {unique_combinations} unique juror-case combinations {total_rounds} times ({total_pairs} total runs)')
                 else:
-                    yield f"data: {json.dumps({'status': 'output', 'message': f'Running {total_rounds} total deliberations with weighted selection'})}\n\n"
+                    yield sse_event('output', f'Running {total_rounds} total deliberations with weighted selection')
                 
-                # Execute each pair
-                for i, pair in enumerate(execution_pairs):
-                    juror_file = pair['juror_file']
-                    case_file = pair['case_file']
-                    run_number = pair['run_number']
-                    
-                    if repeat_mode == 'individual' and 'repeat_iteration' in pair:
-                        repeat_iteration = pair['repeat_iteration']
-                        unique_combinations = len(juror_files_info) * len(case_files_info)
-                        combination_number = ((run_number - 1) % unique_combinations) + 1
-                        run_header = f'\n=== Run {run_number}/{total_pairs} (Combination {combination_number}, Repeat {repeat_iteration}/{total_rounds}) ==='
-                    else:
-                        run_header = f'\n=== Run {run_number}/{total_pairs} ==='
-                        
-                    yield f"data: {json.dumps({'status': 'output', 'message': run_header})}\n\n"
-                    juror_name = juror_file['name']
-                    case_name = case_file['name']
-                    
-                    yield f"data: {json.dumps({'status': 'output', 'message': f'Juror file: {juror_name}'})}\n\n"
-                    yield f"data: {json.dumps({'status': 'output', 'message': f'Case file: {case_name}'})}\n\n"
-                    
-                    # Create a custom Python script that imports from the notebook and calls run_deliberation
-                    jury_file_path = juror_file['path']
-                    case_file_path = case_file['path']
-                    
-                    script_content = f'''
-import sys
-import os
+                # Make sure the notebook functions and the shared runner
+                # script are up to date (cached across requests while the
+                # notebook is unchanged)
+                yield sse_event('output', 'Extracting notebook functions...')
+                extract_notebook_functions(backend_dir)
+                write_runner_script(backend_dir)
+                yield sse_event('output', 'Notebook functions extracted successfully')
 
-# Setup paths and environment
-sys.path.append('{backend_dir}')
+                # One persistent worker serves every run in this request:
+                # it imports the notebook code once and receives each run
+                # as a JSON command on stdin (-u so prints reach the pipe
+                # immediately)
+                worker = subprocess.Popen(
+                    ['python', '-u', 'run_deliberation_runner.py'],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    cwd=backend_dir
+                )
 
-# Change to backend directory to access notebook functions
-os.chdir('{backend_dir}')
+                # Register the process for potential termination
+                current_running_processes.append(worker)
 
-print(f"Run {run_number}: Using jury file: {jury_file_path}")
-print(f"Run {run_number}: Using case file: {case_file_path}")
+                # Pump worker output through a bounded queue from a
+                # dedicated reader thread so the generator never sits in a
+                # blocking readline() between yields
+                output_queue = queue.Queue(maxsize=1024)
 
-# Import and execute the notebook cells
-try:
-    # Execute notebook to set up all functions and variables
-    print("Loading notebook...")
-    exec(open('run_notebook_functions.py').read())
-    
-    print("Starting deliberation...")
-    # Debug: Print the actual paths being passed
-    print(f"DEBUG - About to call run_deliberation with:")
-    print(f"  jury_file='{jury_file_path}'")
-    print(f"  case_file='{case_file_path}'")
-    print(f"  scenario_number=1")
-    print(f"  total_rounds=1")  # Each execution runs only 1 round
-    
-    # Call run_deliberation with uploaded files from temp directories
-    run_deliberation(
-        jury_file="{jury_file_path}",
-        case_file="{case_file_path}",
-        scenario_number=1,
-        total_rounds=1,  # Each pair runs once
-        save_to_file=True
-    )
-    print(f"Run {run_number} completed successfully!")
-    
-except Exception as e:
-    print(f"Error during deliberation run {run_number}: {{e}}")
-    import traceback
-    traceback.print_exc()
-'''
-                    
-                    # Create a Python file with the notebook functions (only once)
-                    notebook_functions_file = os.path.join(backend_dir, 'run_notebook_functions.py')
-                    if i == 0:  # Only create on first run
-                        yield f"data: {json.dumps({'status': 'output', 'message': 'Extracting notebook functions...'})}\n\n"
-                        
-                        # Extract Python code from the notebook
-                        import json as py_json
-                        with open(os.path.join(backend_dir, 'langgraph_jury_deliberation.ipynb'), 'r') as f:
-                            notebook = py_json.load(f)
-                        
-                        python_code = []
-                        for cell in notebook['cells']:
-                            if cell['cell_type'] == 'code':
-                                cell_source = ''.join(cell['source'])
-                                # Filter out notebook-specific commands
-                                lines = cell_source.split('\n')
-                                filtered_lines = []
-                                for line in lines:
-                                    # Skip shell commands (starting with !) and empty lines
-                                    if not line.strip().startswith('!') and line.strip():
-                                        filtered_lines.append(line)
-                                
-                                if filtered_lines:  # Only add if there's actual Python code
-                                    python_code.append('\n'.join(filtered_lines))
-                        
-                        # Write extracted code to a file
-                        with open(notebook_functions_file, 'w') as f:
-                            f.write('\n\n'.join(python_code))
-                        
-                        yield f"data: {json.dumps({'status': 'output', 'message': 'Notebook functions extracted successfully'})}\n\n"
-                    
-                    # Write the script to a temporary file
-                    script_file = os.path.join(backend_dir, f'temp_deliberation_script_run_{run_number}.py')
-                    with open(script_file, 'w') as f:
-                        f.write(script_content)
-                    
-                    yield f"data: {json.dumps({'status': 'output', 'message': f'Executing run {run_number}...'})}\n\n"
-                    
-                    # Execute the script and capture output
-                    process = subprocess.Popen(
-                        ['python', f'temp_deliberation_script_run_{run_number}.py'],
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.STDOUT,
-                        universal_newlines=True,
-                        cwd=backend_dir
-                    )
-                    
-                    # Register the process for potential termination
-                    with process_lock:
-                        current_running_processes.append(process)
-                    
+                def pump_output(proc, q):
+                    # Read the pipe in 64 KiB chunks and split lines in C
+                    # instead of paying a readline call per output line.
+                    # The fd is non-blocking and polled through select so
+                    # a quiet worker parks this thread in the hub instead
+                    # of a blocking read
+                    fd = proc.stdout.fileno()
+                    os.set_blocking(fd, False)
+                    tail = b''
                     try:
-                        # Stream output line by line
-                        for line in iter(process.stdout.readline, ''):
-                            if line:
-                                yield f"data: {json.dumps({'status': 'output', 'message': line.strip()})}\n\n"
-                        
-                        # Wait for process to complete
-                        process.wait()
-                        
+                        while True:
+                            readable, _, _ = select.select([fd], [], [], 0.1)
+                            if not readable:
+                                continue
+                            try:
+                                chunk = os.read(fd, 65536)
+                            except BlockingIOError:
+                                continue
+                            if not chunk:
+                                break
+                            lines = (tail + chunk).split(b'\n')
+                            tail = lines.pop()
+                            for line in lines:
+                                if line:
+                                    q.put(line.decode('utf-8', 'replace'))
+                        if tail:
+                            q.put(tail.decode('utf-8', 'replace'))
                     finally:
-                        # Always unregister the process when done
-                        with process_lock:
-                            if process in current_running_processes:
-                                current_running_processes.remove(process)
-                    
-                    # Clean up temporary script file
+                        q.put(None)
+
+                reader = threading.Thread(target=pump_output, args=(worker, output_queue))
+                reader.daemon = True
+                reader.start()
+
+                try:
+                    # Execute each pair
+                    for pair in execution_pairs:
+                        juror_file = pair['juror_file']
+                        case_file = pair['case_file']
+                        run_number = pair['run_number']
+
+                        if repeat_mode == 'individual' and 'repeat_iteration' in pair:
+                            repeat_iteration = pair['repeat_iteration']
+                            unique_combinations = len(juror_files_info) * len(case_files_info)
+                            combination_number = ((run_number - 1) % unique_combinations) + 1
+                            run_header = f'\n=== Run {run_number}/{total_pairs} (Combination {combination_number}, Repeat {repeat_iteration}/{total_rounds}) ==='
+                        else:
+                            run_header = f'\n=== Run {run_number}/{total_pairs} ==='
+
+                        yield sse_event('output', run_header)
+                        yield sse_event('output', f'Juror file: {juror_file["name"]}')
+                        yield sse_event('output', f'Case file: {case_file["name"]}')
+                        yield sse_event('output', f'Executing run {run_number}...')
+
+                        command = {
+                            'jury_file': juror_file['path'],
+                            'case_file': case_file['path'],
+                            'run_number': run_number
+                        }
+                        worker.stdin.write(_json_bytes(command) + b'\n')
+                        worker.stdin.flush()
+
+                        # Coalesce output frames: consecutive lines are
+                        # batched into one socket write, flushed when the
+                        # buffer reaches 8 KiB, 50 ms have passed, or the
+                        # worker goes quiet. An SSE comment keeps the
+                        # connection alive through long silences.
+                        run_status = None
+                        buf = bytearray()
+                        last_flush = quiet_since = time.monotonic()
+                        while True:
+                            try:
+                                line = output_queue.get(timeout=0.05)
+                            except queue.Empty:
+                                now = time.monotonic()
+                                if buf:
+                                    yield bytes(buf)
+                                    buf.clear()
+                                    last_flush = now
+                                elif now - quiet_since >= 15:
+                                    yield _SSE_KEEPALIVE
+                                    quiet_since = now
+                                continue
+                            quiet_since = time.monotonic()
+                            if line is None:
+                                run_status = 'died'
+                                break
+                            if line.startswith(_RUN_DONE_MARKER):
+                                run_status = line.rsplit(' ', 1)[-1]
+                                break
+                            buf += sse_output(line.strip())
+                            if len(buf) >= 8192 or quiet_since - last_flush >= 0.05:
+                                yield bytes(buf)
+                                buf.clear()
+                                last_flush = quiet_since
+                        if buf:
+                            yield bytes(buf)
+
+                        if run_status == 'ok':
+                            yield sse_event('output', f'Run {run_number} completed successfully')
+                        elif run_status == 'died':
+                            worker.wait()
+                            yield sse_event('error', f'Run {run_number} failed: worker exited with code {worker.returncode}')
+                            break
+                        else:
+                            yield sse_event('error', f'Run {run_number} failed')
+                            # Continue with next runs even if one fails
+
+                finally:
                     try:
-                        os.remove(script_file)
-                    except:
+                        worker.stdin.close()
+                    except OSError:
                         pass
-                    
-                    if process.returncode == 0:
-                        yield f"data: {json.dumps({'status': 'output', 'message': f'Run {run_number} completed successfully'})}\n\n"
-                    else:
-                        yield f"data: {json.dumps({'status': 'error', 'message': f'Run {run_number} failed with code {process.returncode}'})}\n\n"
-                        # Continue with next runs even if one fails
-                
-                # Clean up notebook functions file
-                try:
-                    os.remove(notebook_functions_file)
-                except:
-                    pass
-                
-                yield f"data: {json.dumps({'status': 'completed', 'message': f'All {total_pairs} deliberation runs completed'})}\n\n"
+                    worker.wait()
+                    # Always unregister the process when done
+                    try:
+                        current_running_processes.remove(worker)
+                    except ValueError:
+                        pass  # already removed by /stop_process
+
+                yield sse_event('completed', f'All {total_pairs} deliberation runs completed')
                         
             except Exception as e:
-                yield f"data: {json.dumps({'status': 'error', 'message': f'General error: {str(e)}'})}\n\n"
+                yield sse_event('error', f'General error: {str(e)}')
         
-        return Response(generate(), mimetype='text/event-stream', headers={
-            'Cache-Control': 'no-cache',
-            'Connection': 'keep-alive',
-            'Access-Control-Allow-Origin': '*',
-            'X-Accel-Buffering': 'no'
-        })
+        # direct_passthrough: the generator already yields encoded SSE
+        # frames, so skip werkzeug's response post-processing on them
+        return Response(generate(), mimetype='text/event-stream', direct_passthrough=True, headers=_SSE_HEADERS)
         
     except Exception as e:
         def error_gen():
-            yield f"data: {json.dumps({'status': 'error', 'message': str(e)})}\n\n"
-        return Response(error_gen(), mimetype='text/event-stream', headers={
-            'Cache-Control': 'no-cache',
-            'Connection': 'keep-alive',
-            'Access-Control-Allow-Origin': '*',
-            'X-Accel-Buffering': 'no'
-        })
+            yield sse_event('error', str(e))
+        return Response(error_gen(), mimetype='text/event-stream', headers=_SSE_HEADERS)
         
     except Exception as e:
         def error_gen():
-            yield f"data: {json.dumps({'status': 'error', 'message': str(e)})}\n\n"
-        return Response(error_gen(), mimetype='text/event-stream', headers={
-            'Cache-Control': 'no-cache',
-            'Connection': 'keep-alive',
-            'Access-Control-Allow-Origin': '*',
-            'X-Accel-Buffering': 'no'
-        })
+            yield sse_event('error', str(e))
+        return Response(error_gen(), mimetype='text/event-stream', headers=_SSE_HEADERS)
+
+def _iter_process_lines(process):
+    """Yield stdout lines from a subprocess using non-blocking chunk reads.
+
+    Replaces blocking readline() loops in streaming routes: under the
+    eventlet worker the select() wait yields to the hub, so one running
+    tool no longer pins the worker for every other client. Yields None
+    when the tool has been quiet for about a second so callers can emit
+    a keepalive comment and defeat proxy buffering.
+    """
+    fd = process.stdout.fileno()
+    os.set_blocking(fd, False)
+    tail = b''
+    quiet_since = time.monotonic()
+    while True:
+        ready, _, _ = select.select([fd], [], [], 0.1)
+        if not ready:
+            if process.poll() is not None:
+                break
+            if time.monotonic() - quiet_since >= 1.0:
+                quiet_since = time.monotonic()
+                yield None
+            continue
+        quiet_since = time.monotonic()
+        try:
+            chunk = os.read(fd, 65536)
+        except BlockingIOError:
+            continue
+        except OSError:
+            break
+        if not chunk:
+            break
+        tail += chunk
+        if b'\n' not in tail:
+            continue
+        lines = tail.split(b'\n')
+        tail = lines.pop()
+        for line in lines:
+            yield line.decode('utf-8', 'replace')
+    if tail:
+        yield tail.decode('utf-8', 'replace')
+    process.wait()
+
 
 @app.route("/generate_jurors", methods=["GET"])
 def generate_jurors():
     """Generate jurors using NLPAgentsToolbox and stream the output"""
     try:
         juror_count = request.args.get('count', 5, type=int)
-        logger.info(f"Starting juror generation for {juror_count} jurors")
+        logger.info("Starting juror generation for %s jurors", juror_count)
         
         def generate():
             try:
                 logger.info("Generator function started")
-                # Get the backend directory path (where NLPAgentsToolbox should be)
-                backend_dir = os.path.join(os.path.dirname(__file__), 'backend')
-                nlp_toolbox_dir = os.path.join(backend_dir, 'NLPAgentsToolbox')
-                system_python = '/usr/local/bin/python3'  # Docker container Python path
-                mkbio_script = os.path.join(nlp_toolbox_dir, 'tools', 'mkbio.py')
-                lsbio_script = os.path.join(nlp_toolbox_dir, 'tools', 'lsbio.py')
+                nlp_toolbox_dir = NLP_TOOLBOX_DIR
+                system_python = SYSTEM_PYTHON
+                mkbio_script = MKBIO_SCRIPT
+                lsbio_script = LSBIO_SCRIPT
                 
-                yield f"data: {json.dumps({'status': 'started', 'message': f'Starting juror generation for {juror_count} jurors...'})}\n\n"
+                yield sse_event('started', f'Starting juror generation for {juror_count} jurors...')
                 
                 # Check if NLPAgentsToolbox exists
                 if not os.path.exists(nlp_toolbox_dir):
-                    yield f"data: {json.dumps({'status': 'error', 'message': f'NLPAgentsToolbox not found at {nlp_toolbox_dir}'})}\n\n"
+                    yield sse_event('error', f'NLPAgentsToolbox not found at {nlp_toolbox_dir}')
                     return
                 
                 # Check if system Python exists
                 if not os.path.exists(system_python):
-                    yield f"data: {json.dumps({'status': 'error', 'message': f'System Python not found at {system_python}'})}\n\n"
+                    yield sse_event('error', f'System Python not found at {system_python}')
                     return
                 
                 # Check if scripts exist
                 if not os.path.exists(mkbio_script):
-                    yield f"data: {json.dumps({'status': 'error', 'message': f'mkbio.py not found at {mkbio_script}'})}\n\n"
+                    yield sse_event('error', f'mkbio.py not found at {mkbio_script}')
                     return
                     
                 if not os.path.exists(lsbio_script):
-                    yield f"data: {json.dumps({'status': 'error', 'message': f'lsbio.py not found at {lsbio_script}'})}\n\n"
+                    yield sse_event('error', f'lsbio.py not found at {lsbio_script}')
                     return
                 
                 # Step 1: Run mkbio.py using the virtual environment Python directly
-                yield f"data: {json.dumps({'status': 'output', 'message': f'Running mkbio.py -n {juror_count}...'})}\n\n"
+                yield sse_event('output', f'Running mkbio.py -n {juror_count}...')
                 
                 # Prepare environment variables for the subprocess
                 env = os.environ.copy()
                 env['PROJECT_ROOT'] = nlp_toolbox_dir
-                env['BUILD_DIR'] = os.path.join(nlp_toolbox_dir, 'build')
-                env['DATABASE_FILE'] = os.path.join(nlp_toolbox_dir, 'build', 'juror.db')
+                env['BUILD_DIR'] = BUILD_DIR
+                env['DATABASE_FILE'] = JUROR_DB
                 
                 # Ensure build directory exists
                 os.makedirs(env['BUILD_DIR'], exist_ok=True)
@@ -659,63 +1172,59 @@ def generate_jurors():
                     [system_python, mkbio_script, '-n', str(juror_count)],
                     stdout=subprocess.PIPE,
                     stderr=subprocess.PIPE,
-                    universal_newlines=True,
                     cwd=nlp_toolbox_dir,
                     env=env
                 )
-                
+
                 # Stream output in real-time
-                while True:
-                    output = process.stdout.readline()
-                    if output == '' and process.poll() is not None:
-                        break
-                    if output:
-                        yield f"data: {json.dumps({'status': 'output', 'message': output.strip()})}\n\n"
-                
+                for output in _iter_process_lines(process):
+                    if output is None:
+                        yield _SSE_KEEPALIVE
+                    elif output.strip():
+                        yield sse_output(output.strip())
+
                 # Get any remaining stderr
-                stderr_output = process.stderr.read()
+                stderr_output = process.stderr.read().decode('utf-8', 'replace')
                 if stderr_output:
-                    yield f"data: {json.dumps({'status': 'output', 'message': f'mkbio stderr: {stderr_output.strip()}'})}\n\n"
+                    yield sse_event('output', f'mkbio stderr: {stderr_output.strip()}')
                 
                 if process.returncode != 0:
                     if process.returncode is None:
                         # Check if the database file was created despite the process crashing
-                        db_file = os.path.join(nlp_toolbox_dir, 'build', 'juror.db')
+                        db_file = JUROR_DB
                         if os.path.exists(db_file):
-                            yield f"data: {json.dumps({'status': 'warning', 'message': 'mkbio.py process terminated abnormally, but database file was created. Proceeding...'})}\n\n"
+                            yield sse_event('warning', 'mkbio.py process terminated abnormally, but database file was created. Proceeding...')
                         else:
-                            yield f"data: {json.dumps({'status': 'error', 'message': 'mkbio.py process crashed or was terminated unexpectedly and no database was created'})}\n\n"
+                            yield sse_event('error', 'mkbio.py process crashed or was terminated unexpectedly and no database was created')
                             return
                     else:
-                        yield f"data: {json.dumps({'status': 'error', 'message': f'mkbio.py failed with return code {process.returncode}'})}\n\n"
+                        yield sse_event('error', f'mkbio.py failed with return code {process.returncode}')
                         return
                 
-                yield f"data: {json.dumps({'status': 'output', 'message': 'mkbio.py completed successfully'})}\n\n"
+                yield _SSE_MKBIO_OK
                 
                 # Step 2: Run lsbio.py -e using the virtual environment Python directly
-                yield f"data: {json.dumps({'status': 'output', 'message': 'Running lsbio.py -e...'})}\n\n"
+                yield _SSE_RUNNING_LSBIO
                 
                 process = subprocess.Popen(
                     [system_python, lsbio_script, '-e'],
                     stdout=subprocess.PIPE,
                     stderr=subprocess.PIPE,
-                    universal_newlines=True,
                     cwd=nlp_toolbox_dir,
                     env=env
                 )
-                
+
                 # Stream output in real-time
-                while True:
-                    output = process.stdout.readline()
-                    if output == '' and process.poll() is not None:
-                        break
-                    if output:
-                        yield f"data: {json.dumps({'status': 'output', 'message': output.strip()})}\n\n"
-                
+                for output in _iter_process_lines(process):
+                    if output is None:
+                        yield _SSE_KEEPALIVE
+                    elif output.strip():
+                        yield sse_output(output.strip())
+
                 # Get any remaining stderr
-                stderr_output = process.stderr.read()
+                stderr_output = process.stderr.read().decode('utf-8', 'replace')
                 if stderr_output:
-                    yield f"data: {json.dumps({'status': 'output', 'message': f'lsbio stderr: {stderr_output.strip()}'})}\n\n"
+                    yield sse_event('output', f'lsbio stderr: {stderr_output.strip()}')
                 
                 # Check the return code properly
                 if process.returncode is None:
@@ -726,75 +1235,59 @@ def generate_jurors():
                         process.wait(timeout=5)
                     except:
                         pass
-                    yield f"data: {json.dumps({'status': 'warning', 'message': 'lsbio.py process may have terminated abnormally, checking output file...'})}\n\n"
+                    yield sse_event('warning', 'lsbio.py process may have terminated abnormally, checking output file...')
                     
                     # Check if the YAML file was created successfully
-                    yaml_path = os.path.join(nlp_toolbox_dir, 'build', 'jurors.yaml')
+                    yaml_path = os.path.join(BUILD_DIR, 'jurors.yaml')
                     if os.path.exists(yaml_path):
-                        yield f"data: {json.dumps({'status': 'output', 'message': f'YAML file found at {yaml_path}, continuing...'})}\n\n"
+                        yield sse_event('output', f'YAML file found at {yaml_path}, continuing...')
                     else:
-                        yield f"data: {json.dumps({'status': 'error', 'message': 'lsbio.py failed: no output file was created.'})}\n\n"
+                        yield sse_event('error', 'lsbio.py failed: no output file was created.')
                         return
                 elif process.returncode != 0:
-                    yield f"data: {json.dumps({'status': 'warning', 'message': f'lsbio.py returned non-zero exit code {process.returncode}, checking output file...'})}\n\n"
+                    yield sse_event('warning', f'lsbio.py returned non-zero exit code {process.returncode}, checking output file...')
                     
                     # Check if the YAML file was created successfully despite the error
-                    yaml_path = os.path.join(nlp_toolbox_dir, 'build', 'jurors.yaml')
+                    yaml_path = os.path.join(BUILD_DIR, 'jurors.yaml')
                     if os.path.exists(yaml_path):
-                        yield f"data: {json.dumps({'status': 'output', 'message': f'YAML file found at {yaml_path}, continuing despite error...'})}\n\n"
+                        yield sse_event('output', f'YAML file found at {yaml_path}, continuing despite error...')
                     else:
-                        yield f"data: {json.dumps({'status': 'error', 'message': f'lsbio.py failed with return code {process.returncode} and no output file was created.'})}\n\n"
+                        yield sse_event('error', f'lsbio.py failed with return code {process.returncode} and no output file was created.')
                         return
                     
-                yield f"data: {json.dumps({'status': 'output', 'message': 'lsbio.py completed successfully'})}\n\n"
+                yield _SSE_LSBIO_OK
                 
                 # Step 3: Move jurors.yaml to temp directory
-                jurors_yaml_source = os.path.join(nlp_toolbox_dir, 'build', 'jurors.yaml')
-                yield f"data: {json.dumps({'status': 'output', 'message': f'Looking for jurors.yaml at: {jurors_yaml_source}'})}\n\n"
-                
-                if os.path.exists(jurors_yaml_source):
+                jurors_yaml_source, build_files = _find_yaml(nlp_toolbox_dir)
+                yield sse_event('output', f'Looking for jurors.yaml in: {BUILD_DIR}')
+
+                if jurors_yaml_source:
                     filename = f"generated_jurors_{int(time.time())}.yaml"
                     jurors_yaml_dest = os.path.join(JUROR_DIR, filename)
-                    shutil.copy2(jurors_yaml_source, jurors_yaml_dest)
-                    
-                    yield f"data: {json.dumps({'status': 'output', 'message': f'Generated jurors saved as {filename}'})}\n\n"
-                    yield f"data: {json.dumps({'status': 'completed', 'message': f'Successfully generated {juror_count} jurors', 'filename': filename})}\n\n"
+                    _fast_move(jurors_yaml_source, jurors_yaml_dest)
+
+                    yield sse_event('output', f'Generated jurors saved as {filename}')
+                    yield sse_event('completed', f'Successfully generated {juror_count} jurors', filename=filename)
                 else:
-                        # Check in build directory as well
-                    build_dir_path = os.path.join(nlp_toolbox_dir, 'build')
-                    if os.path.exists(build_dir_path):
-                        build_files = os.listdir(build_dir_path)
-                        yield f"data: {json.dumps({'status': 'output', 'message': f'Files in build directory: {build_files}'})}\n\n"
-                    
-                    # List files in the directory to help debug
-                    try:
-                        files_in_dir = os.listdir(nlp_toolbox_dir)
-                        yield f"data: {json.dumps({'status': 'output', 'message': f'Files in NLP toolbox dir: {files_in_dir}'})}\n\n"
-                    except Exception as debug_e:
-                        yield f"data: {json.dumps({'status': 'output', 'message': f'Could not list directory: {str(debug_e)}'})}\n\n"
-                    yield f"data: {json.dumps({'status': 'error', 'message': 'jurors.yaml not found after generation'})}\n\n"
+                    yield sse_event('output', f'Files in build directory: {build_files}')
+                    yield sse_event('error', 'jurors.yaml not found after generation')
                     
             except Exception as e:
-                import traceback
                 error_trace = traceback.format_exc()
-                logger.error(f"Error in generate_jurors generator: {str(e)}")
-                logger.error(f"Traceback: {error_trace}")
-                yield f"data: {json.dumps({'status': 'error', 'message': f'Error during juror generation: {str(e)}'})}\n\n"
-                yield f"data: {json.dumps({'status': 'error', 'message': f'Full traceback: {error_trace}'})}\n\n"
+                logger.error("Error in generate_jurors generator: %s", str(e))
+                logger.error("Traceback: %s", error_trace)
+                yield sse_event('error', f'Error during juror generation: {str(e)}')
+                yield sse_event('error', f'Full traceback: {error_trace}')
         
-        return Response(generate(), 
+        return Response(generate(),
                        mimetype='text/event-stream',
-                       headers={
-                           'Cache-Control': 'no-cache',
-                           'Connection': 'keep-alive',
-                           'Access-Control-Allow-Origin': '*',
-                           'X-Accel-Buffering': 'no'
-                       })
+                       direct_passthrough=True,
+                       headers=_SSE_HEADERS)
     
     except Exception as e:
-        logger.error(f"Error in generate_jurors route: {str(e)}")
+        logger.error("Error in generate_jurors route: %s", str(e))
         def error_gen():
-            yield f"data: {json.dumps({'status': 'error', 'message': f'Route error: {str(e)}'})}\n\n"
+            yield sse_event('error', f'Route error: {str(e)}')
         return Response(error_gen(), mimetype='text/event-stream')
 
 @app.route('/test-env')
@@ -813,149 +1306,235 @@ def test_env():
     }
     return jsonify(env_info)
 
-# Initialize API key file from environment variable if available
+# Normalize the API key into the environment variable the notebook reads
 def initialize_api_key():
-    """Create API key file from environment variable if available"""
-    # Try both environment variable names for compatibility
-    api_key = os.environ.get('OPENAI_API_KEY') or os.environ.get('GOOGLE_API_KEY')
+    """Expose the API key as GOOGLE_API_KEY in this process's environment.
+
+    The notebook code checks os.environ['GOOGLE_API_KEY'] first, and
+    every deliberation subprocess inherits our environment, so there is
+    no need to write the secret to an api_key file on disk. The
+    notebook's file-based lookup remains as a fallback for local dev.
+    """
+    api_key = os.environ.get('GOOGLE_API_KEY') or os.environ.get('OPENAI_API_KEY')
     if api_key:
-        # Create api_key file in backend directory where notebook expects it
-        backend_dir = os.path.join(os.path.dirname(__file__), 'backend')
-        os.makedirs(backend_dir, exist_ok=True)
-        api_key_path = os.path.join(backend_dir, 'api_key')
-        
-        try:
-            with open(api_key_path, 'w') as f:
-                f.write(api_key.strip())
-            logger.info(f"API key file created at: {api_key_path}")
-        except Exception as e:
-            logger.error(f"Failed to create API key file: {e}")
+        os.environ['GOOGLE_API_KEY'] = api_key.strip()
+        logger.info("API key loaded into environment for subprocess inheritance")
     else:
         logger.warning("No OPENAI_API_KEY or GOOGLE_API_KEY environment variable found")
 
 # Initialize API key on startup
 initialize_api_key()
 
-# Global dictionary to store active terminal sessions
+# Warm the notebook extraction and runner script so the first
+# /run_notebook request doesn't pay for them (near no-op when the
+# container build already extracted the notebook)
+try:
+    extract_notebook_functions(BACKEND_DIR)
+    write_runner_script(BACKEND_DIR)
+except Exception as e:
+    logger.warning("Notebook pre-extraction failed: %s", e)
+
+# Global dictionary to store active terminal sessions. Bounded: a
+# session that never reaches cleanup_terminal would otherwise leak its
+# pty fd and process entry forever.
 active_terminals = {}
+_MAX_TERMINAL_SESSIONS = 256
+_TERMINAL_IDLE_TTL = 3600  # reap sessions with no activity for an hour
+
+
+class _TerminalBatch:
+    """Collect terminal output lines and emit them as a single frame.
+
+    The pty read loops already coalesce bursts via _read_pty_burst; this
+    covers the multi-line status and diagnostic sequences, which would
+    otherwise send one WebSocket frame per line.
+    """
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.parts = []
+
+    def write(self, data):
+        self.parts.append(data)
+
+    def flush(self):
+        if self.parts:
+            socketio.emit('terminal_output', {'data': ''.join(self.parts)},
+                          room=self.session_id)
+            self.parts.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+
+def _register_terminal(session_id, info):
+    """Insert a terminal session, evicting the oldest one when full."""
+    info['started'] = info['last_used'] = time.monotonic()
+    while len(active_terminals) >= _MAX_TERMINAL_SESSIONS:
+        oldest = next(iter(active_terminals))
+        logger.warning("Terminal session limit reached, evicting %s", oldest)
+        cleanup_terminal(oldest)
+    active_terminals[session_id] = info
+
+
+def _sweep_terminals():
+    """Reap sessions whose process has exited but that were never
+    cleaned up (client vanished without a disconnect event)."""
+    while True:
+        time.sleep(30)
+        now = time.monotonic()
+        for session_id, info in list(active_terminals.items()):
+            process = info.get('process')
+            if (process is not None and process.poll() is not None
+                    and now - info.get('started', now) > 60):
+                logger.info("Sweeping dead terminal session %s", session_id)
+                cleanup_terminal(session_id)
+            elif now - info.get('last_used', now) > _TERMINAL_IDLE_TTL:
+                logger.info("Sweeping idle terminal session %s", session_id)
+                cleanup_terminal(session_id)
+
+
+_terminal_sweeper = threading.Thread(target=_sweep_terminals, daemon=True)
+_terminal_sweeper.start()
+
+@functools.lru_cache(maxsize=4)
+def _load_api_key(path, mtime_ns):
+    """Parse an api_key file; cached on (path, mtime) so back-to-back
+    generation events skip the re-open and re-parse."""
+    with open(path, 'r') as f:
+        content = f.read().strip()
+    # Handle both export statement format and direct key format
+    if content.startswith("export OPENAI_API_KEY="):
+        return content.split("'")[1] if "'" in content else content.split("=")[1].strip('"')
+    return content
+
+def _read_pty_burst(master_fd):
+    """Drain a burst of pty output into one payload.
+
+    Reads 64 KiB at a time and keeps reading while more data arrives
+    within a 20 ms window (capped at 256 KiB), so one SocketIO frame
+    carries a whole burst instead of one frame per kilobyte. Returns
+    (text, eof) where eof means the slave side has closed (an EIO from
+    the master is the normal end-of-process signal).
+    """
+    chunks = []
+    total = 0
+    eof = False
+    while True:
+        try:
+            chunk = os.read(master_fd, 65536)
+        except BlockingIOError:
+            break  # burst drained (the masters are non-blocking)
+        except OSError:
+            eof = True
+            break
+        if not chunk:
+            eof = True
+            break
+        chunks.append(chunk)
+        total += len(chunk)
+        if total >= 256 * 1024:
+            break
+        ready, _, _ = select.select([master_fd], [], [], 0.02)
+        if not ready:
+            break
+    return b''.join(chunks).decode('utf-8', errors='ignore'), eof
+
+def get_toolbox_api_key(nlp_toolbox_dir):
+    """Resolve the API key for toolbox subprocesses.
+
+    Returns (key, source) where source is 'file', 'environment',
+    'Google environment', or None when no key is available anywhere.
+    """
+    api_key_file = os.path.join(nlp_toolbox_dir, 'api_key')
+    try:
+        st = os.stat(api_key_file)
+    except OSError:
+        st = None
+    if st is not None:
+        return _load_api_key(api_key_file, st.st_mtime_ns), 'file'
+    if 'OPENAI_API_KEY' in os.environ:
+        return os.environ['OPENAI_API_KEY'], 'environment'
+    if 'GOOGLE_API_KEY' in os.environ:
+        return os.environ['GOOGLE_API_KEY'], 'Google environment'
+    return None, None
 
 @socketio.on('start_interactive_generation')
 def handle_start_interactive_generation(data):
     """Start an interactive juror generation session"""
     try:
-        logger.info(f"Received start_interactive_generation event with data: {data}")
+        logger.info("Received start_interactive_generation event with data: %s", data)
         juror_count = data.get('count', 5)
         session_id = request.sid
-        logger.info(f"Starting generation for {juror_count} jurors, session_id: {session_id}")
-        
-        # Get the backend directory path
-        backend_dir = os.path.join(os.path.dirname(__file__), 'backend')
-        nlp_toolbox_dir = os.path.join(backend_dir, 'NLPAgentsToolbox')
-        
-        # Use system Python instead of virtual environment Python
-        system_python = '/usr/local/bin/python3'  # Docker container Python path
-        mkbio_script = os.path.join(nlp_toolbox_dir, 'tools', 'mkbio.py')
-        rmbio_script = os.path.join(nlp_toolbox_dir, 'tools', 'rmbio.py')
-        
-        logger.info(f"Backend dir: {backend_dir}")
-        logger.info(f"NLP toolbox dir: {nlp_toolbox_dir}")
-        logger.info(f"System python: {system_python}")
-        logger.info(f"mkbio script: {mkbio_script}")
-        logger.info(f"rmbio script: {rmbio_script}")
+        logger.info("Starting generation for %s jurors, session_id: %s", juror_count, session_id)
         
+        nlp_toolbox_dir = NLP_TOOLBOX_DIR
+        system_python = SYSTEM_PYTHON
+        mkbio_script = MKBIO_SCRIPT
+
+        logger.info("NLP toolbox dir: %s", nlp_toolbox_dir)
+
         emit('terminal_output', {'data': f'Starting interactive juror generation for {juror_count} jurors...\r\n'})
-        
-        # Check if paths exist
-        if not os.path.exists(nlp_toolbox_dir):
-            logger.error(f"NLPAgentsToolbox not found at {nlp_toolbox_dir}")
-            emit('terminal_output', {'data': f'Error: NLPAgentsToolbox not found at {nlp_toolbox_dir}\r\n'})
-            return
-            
-        if not os.path.exists(system_python):
-            logger.error(f"System Python not found at {system_python}")
+
+        # Check paths: the interpreter was checked once at import, and a
+        # single directory read of tools/ replaces the per-script stats
+        if not _SYSTEM_PYTHON_OK:
+            logger.error("System Python not found at %s", system_python)
             emit('terminal_output', {'data': f'Error: System Python not found at {system_python}\r\n'})
             return
-            
-        if not os.path.exists(mkbio_script):
-            logger.error(f"mkbio.py not found at {mkbio_script}")
-            emit('terminal_output', {'data': f'Error: mkbio.py not found at {mkbio_script}\r\n'})
+
+        try:
+            with os.scandir(TOOLS_DIR) as it:
+                tool_names = {e.name for e in it}
+        except FileNotFoundError:
+            logger.error("NLPAgentsToolbox not found at %s", nlp_toolbox_dir)
+            emit('terminal_output', {'data': f'Error: NLPAgentsToolbox not found at {nlp_toolbox_dir}\r\n'})
             return
-            
-        if not os.path.exists(rmbio_script):
-            logger.error(f"rmbio.py not found at {rmbio_script}")
-            emit('terminal_output', {'data': f'Error: rmbio.py not found at {rmbio_script}\r\n'})
+
+        if 'mkbio.py' not in tool_names:
+            logger.error("mkbio.py not found at %s", mkbio_script)
+            emit('terminal_output', {'data': f'Error: mkbio.py not found at {mkbio_script}\r\n'})
             return
-        
+
         logger.info("All paths exist, creating pseudo-terminal...")
         
         # Create a pseudo-terminal
         master_fd, slave_fd = pty.openpty()
-        logger.info(f"Created pty: master_fd={master_fd}, slave_fd={slave_fd}")
+        # Non-blocking from the start so reads never stall a greenlet and
+        # the final-drain path doesn't need to toggle fd flags
+        os.set_blocking(master_fd, False)
+        logger.info("Created pty: master_fd=%s, slave_fd=%s", master_fd, slave_fd)
         
         # Set up environment variables for the process
         env = os.environ.copy()
         
-        # Read API key from the toolbox api_key file or environment variable
-        api_key_file = os.path.join(nlp_toolbox_dir, 'api_key')
-        if os.path.exists(api_key_file):
-            with open(api_key_file, 'r') as f:
-                content = f.read().strip()
-                # Handle both export statement format and direct key format
-                if content.startswith("export OPENAI_API_KEY="):
-                    # Extract the API key from the export statement
-                    api_key = content.split("'")[1] if "'" in content else content.split("=")[1].strip('"')
-                else:
-                    # Direct API key content
-                    api_key = content
-                env['OPENAI_API_KEY'] = api_key
-                emit('terminal_output', {'data': 'API key loaded from file\r\n'})
-                logger.info("API key loaded from file")
-        elif 'OPENAI_API_KEY' in os.environ:
-            # Use environment variable (for Cloud Run deployment)
-            env['OPENAI_API_KEY'] = os.environ['OPENAI_API_KEY']
-            emit('terminal_output', {'data': 'API key loaded from environment\r\n'})
-            logger.info("API key loaded from environment variable")
-        elif 'GOOGLE_API_KEY' in os.environ:
-            # Use Google API key as fallback
-            env['OPENAI_API_KEY'] = os.environ['GOOGLE_API_KEY']
-            emit('terminal_output', {'data': 'API key loaded from Google environment\r\n'})
-            logger.info("API key loaded from GOOGLE_API_KEY environment variable")
+        # Read API key from the toolbox api_key file or environment
+        # variable (cached on the file's mtime)
+        api_key, api_key_source = get_toolbox_api_key(nlp_toolbox_dir)
+        if api_key:
+            env['OPENAI_API_KEY'] = api_key
+            emit('terminal_output', {'data': f'API key loaded from {api_key_source}\r\n'})
+            logger.info("API key loaded from %s", api_key_source)
         else:
-            logger.warning(f"API key not found in file {api_key_file} or environment")
+            logger.warning("API key not found in %s or environment", nlp_toolbox_dir)
             emit('terminal_output', {'data': 'Warning: No API key found\r\n'})
         
-        # Run rmbio.py -A before starting the generation process
-        logger.info("Running rmbio.py -A to clean up before generation...")
-        emit('terminal_output', {'data': 'Cleaning up previous data with rmbio.py -A...\r\n'})
-        
+        # Clean up previous data before starting the generation process.
+        # rmbio.py -A only deletes the juror database, so do the unlink
+        # in-process instead of paying an interpreter start for it.
+        logger.info("Removing previous juror database before generation...")
+        emit('terminal_output', {'data': 'Cleaning up previous data...\r\n'})
+
         try:
-            rmbio_result = subprocess.run(
-                [system_python, rmbio_script, '-A'],
-                cwd=nlp_toolbox_dir,
-                env=env,
-                capture_output=True,
-                text=True,
-                timeout=30  # 30 second timeout
-            )
-            
-            if rmbio_result.returncode == 0:
-                logger.info("rmbio.py -A completed successfully")
-                emit('terminal_output', {'data': 'Cleanup completed successfully\r\n'})
-            else:
-                logger.warning(f"rmbio.py -A returned code {rmbio_result.returncode}")
-                emit('terminal_output', {'data': f'Cleanup completed with warnings (exit code: {rmbio_result.returncode})\r\n'})
-                
-            # Log any output from rmbio
-            if rmbio_result.stdout:
-                logger.info(f"rmbio stdout: {rmbio_result.stdout}")
-            if rmbio_result.stderr:
-                logger.info(f"rmbio stderr: {rmbio_result.stderr}")
-                
-        except subprocess.TimeoutExpired:
-            logger.error("rmbio.py -A timed out")
-            emit('terminal_output', {'data': 'Cleanup timed out, proceeding anyway...\r\n'})
-        except Exception as e:
-            logger.error(f"Error running rmbio.py -A: {e}")
+            os.unlink(JUROR_DB)
+            emit('terminal_output', {'data': 'Cleanup completed successfully\r\n'})
+        except FileNotFoundError:
+            emit('terminal_output', {'data': 'Cleanup completed successfully\r\n'})
+        except OSError as e:
+            logger.error("Error removing juror database: %s", e)
             emit('terminal_output', {'data': f'Cleanup error: {str(e)}, proceeding anyway...\r\n'})
         
         logger.info("Starting subprocess...")
@@ -968,35 +1547,37 @@ def handle_start_interactive_generation(data):
             stderr=slave_fd,
             cwd=nlp_toolbox_dir,
             env=env,
-            preexec_fn=os.setsid
+            start_new_session=True
         )
         
-        logger.info(f"Process started with PID: {process.pid}")
+        logger.info("Process started with PID: %s", process.pid)
         
         # Close the slave fd in the parent process
         os.close(slave_fd)
         
         # Store the terminal session
-        active_terminals[session_id] = {
+        _register_terminal(session_id, {
             'process': process,
             'master_fd': master_fd,
             'nlp_toolbox_dir': nlp_toolbox_dir,
-            'juror_count': juror_count
-        }
-        
-        logger.info(f"Stored terminal session for {session_id}")
+            'juror_count': juror_count,
+            'env': env  # reused by the lsbio phase
+        })
+
+        logger.info("Stored terminal session for %s", session_id)
         
         # Start a thread to read from the terminal
         def read_terminal():
             logger.info("Starting terminal reader thread...")
             try:
-                # Wait for process to complete with timeout
-                start_time = time.time()
-                timeout = 300  # 5 minutes timeout
-                
-                while process.poll() is None:
-                    # Check for timeout
-                    if time.time() - start_time > timeout:
+                # Wait for process to complete with timeout. Child exit
+                # surfaces as EOF (EIO) on the pty master, so the loop
+                # blocks in select instead of issuing a waitpid per tick.
+                deadline = time.monotonic() + 300  # 5 minutes timeout
+
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
                         logger.error("Process timed out after 5 minutes")
                         socketio.emit('terminal_output', {'data': '\r\nProcess timed out after 5 minutes\r\n'}, room=session_id)
                         try:
@@ -1005,18 +1586,20 @@ def handle_start_interactive_generation(data):
                         except:
                             process.kill()
                         break
-                    
-                    # Check if there's data to read
-                    ready, _, _ = select.select([master_fd], [], [], 0.1)
-                    if ready:
-                        try:
-                            data = os.read(master_fd, 1024).decode('utf-8', errors='ignore')
-                            if data:
-                                logger.debug(f"Terminal output: {repr(data)}")
-                                socketio.emit('terminal_output', {'data': data}, room=session_id)
-                        except OSError as e:
-                            logger.error(f"OSError reading from terminal: {e}")
-                            break
+
+                    # Wait for data, coalescing a burst into one emit
+                    ready, _, _ = select.select([master_fd], [], [], min(remaining, 30.0))
+                    if not ready:
+                        continue
+                    data, eof = _read_pty_burst(master_fd)
+                    if data:
+                        logger.debug("Terminal output: %r", data)
+                        socketio.emit('terminal_output', {'data': data}, room=session_id)
+                        info = active_terminals.get(session_id)
+                        if info:
+                            info['last_used'] = time.monotonic()
+                    if eof:
+                        break
                 
                 # Ensure process is finished and get final return code
                 try:
@@ -1027,31 +1610,28 @@ def handle_start_interactive_generation(data):
                     process.wait()
                 
                 return_code = process.returncode
-                logger.info(f"Process finished with return code: {return_code}")
+                logger.info("Process finished with return code: %s", return_code)
                 
-                # Read any remaining output from the pseudo-terminal
+                # Read any remaining output from the pseudo-terminal.
+                # The master is non-blocking since creation, so this is a
+                # plain drain loop with no fd flag juggling.
                 try:
-                    # Set non-blocking mode to read any remaining data
-                    import fcntl
-                    flags = fcntl.fcntl(master_fd, fcntl.F_GETFL)
-                    fcntl.fcntl(master_fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
-                    
                     remaining_data = ""
                     while True:
                         try:
-                            chunk = os.read(master_fd, 1024).decode('utf-8', errors='ignore')
+                            chunk = os.read(master_fd, 65536).decode('utf-8', errors='ignore')
                             if not chunk:
                                 break
                             remaining_data += chunk
                         except OSError:
                             break
-                    
+
                     if remaining_data:
                         socketio.emit('terminal_output', {'data': remaining_data}, room=session_id)
-                        logger.info(f"Final output: {remaining_data}")
+                        logger.info("Final output: %s", remaining_data)
                         
                 except Exception as e:
-                    logger.error(f"Error reading final output: {e}")
+                    logger.error("Error reading final output: %s", e)
                 
                 # Process finished, check if we need to run lsbio
                 if return_code == 0:
@@ -1059,7 +1639,7 @@ def handle_start_interactive_generation(data):
                     run_lsbio_phase(session_id)
                 elif return_code is None:
                     # Check if the database file was created despite the process crashing
-                    db_file = os.path.join(nlp_toolbox_dir, 'build', 'juror.db')
+                    db_file = JUROR_DB
                     if os.path.exists(db_file):
                         socketio.emit('terminal_output', {'data': '\r\nmkbio.py process terminated abnormally, but database file was created. Proceeding to lsbio.py...\r\n'}, room=session_id)
                         run_lsbio_phase(session_id)
@@ -1067,42 +1647,41 @@ def handle_start_interactive_generation(data):
                         error_msg = '\r\nmkbio.py process crashed or was terminated unexpectedly\r\n'
                         socketio.emit('terminal_output', {'data': error_msg}, room=session_id)
                 else:
-                    error_msg = f'\r\nmkbio.py failed with return code {return_code}\r\n'
-                    socketio.emit('terminal_output', {'data': error_msg}, room=session_id)
-                    
-                    # Try to get more error information by running a simpler test
-                    socketio.emit('terminal_output', {'data': 'Attempting to diagnose the issue...\r\n'}, room=session_id)
-                    
-                    try:
-                        # Test if the Python executable works
-                        test_result = subprocess.run([system_python, '--version'], 
-                                                   capture_output=True, text=True, timeout=10)
-                        if test_result.returncode == 0:
-                            socketio.emit('terminal_output', {'data': f'Python version: {test_result.stdout.strip()}\r\n'}, room=session_id)
-                        else:
-                            socketio.emit('terminal_output', {'data': f'Python test failed: {test_result.stderr}\r\n'}, room=session_id)
-                    except Exception as e:
-                        socketio.emit('terminal_output', {'data': f'Python test error: {str(e)}\r\n'}, room=session_id)
-                    
-                    try:
-                        # Test if the script exists and is readable
-                        if os.path.exists(mkbio_script):
-                            socketio.emit('terminal_output', {'data': f'mkbio.py exists at {mkbio_script}\r\n'}, room=session_id)
-                            # Try to read the first few lines
-                            with open(mkbio_script, 'r') as f:
-                                first_lines = ''.join(f.readlines()[:5])
-                            socketio.emit('terminal_output', {'data': f'Script starts with:\r\n{first_lines}\r\n'}, room=session_id)
-                        else:
-                            socketio.emit('terminal_output', {'data': f'mkbio.py NOT FOUND at {mkbio_script}\r\n'}, room=session_id)
-                    except Exception as e:
-                        socketio.emit('terminal_output', {'data': f'Script check error: {str(e)}\r\n'}, room=session_id)
-                    
+                    # Batch the diagnostic lines into one frame instead
+                    # of a WebSocket emit per line
+                    with _TerminalBatch(session_id) as batch:
+                        batch.write(f'\r\nmkbio.py failed with return code {return_code}\r\n')
+                        batch.write('Attempting to diagnose the issue...\r\n')
+
+                        try:
+                            # Test if the Python executable works
+                            test_result = subprocess.run([system_python, '--version'],
+                                                       capture_output=True, text=True, timeout=10)
+                            if test_result.returncode == 0:
+                                batch.write(f'Python version: {test_result.stdout.strip()}\r\n')
+                            else:
+                                batch.write(f'Python test failed: {test_result.stderr}\r\n')
+                        except Exception as e:
+                            batch.write(f'Python test error: {str(e)}\r\n')
+
+                        try:
+                            # Test if the script exists and is readable
+                            if os.path.exists(mkbio_script):
+                                batch.write(f'mkbio.py exists at {mkbio_script}\r\n')
+                                # Try to read the first few lines
+                                with open(mkbio_script, 'r') as f:
+                                    first_lines = ''.join(islice(f, 5))
+                                batch.write(f'Script starts with:\r\n{first_lines}\r\n')
+                            else:
+                                batch.write(f'mkbio.py NOT FOUND at {mkbio_script}\r\n')
+                        except Exception as e:
+                            batch.write(f'Script check error: {str(e)}\r\n')
+
                     cleanup_terminal(session_id)
                     
             except Exception as e:
-                logger.error(f"Error reading terminal: {e}")
-                import traceback
-                logger.error(f"Traceback: {traceback.format_exc()}")
+                logger.error("Error reading terminal: %s", e)
+                logger.error("Traceback: %s", traceback.format_exc())
                 socketio.emit('terminal_output', {'data': f'\r\nError reading terminal: {str(e)}\r\n'}, room=session_id)
                 cleanup_terminal(session_id)
         
@@ -1112,9 +1691,8 @@ def handle_start_interactive_generation(data):
         logger.info("Terminal reader thread started")
         
     except Exception as e:
-        logger.error(f"Error starting interactive generation: {e}")
-        import traceback
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.error("Error starting interactive generation: %s", e)
+        logger.error("Traceback: %s", traceback.format_exc())
         emit('terminal_output', {'data': f'Error starting generation: {str(e)}\r\n'})
 
 def run_lsbio_phase(session_id):
@@ -1125,27 +1703,22 @@ def run_lsbio_phase(session_id):
             return
             
         nlp_toolbox_dir = terminal_info['nlp_toolbox_dir']
-        system_python = '/usr/local/bin/python3'  # Docker container Python path
-        lsbio_script = os.path.join(nlp_toolbox_dir, 'tools', 'lsbio.py')
+        system_python = SYSTEM_PYTHON
+        lsbio_script = LSBIO_SCRIPT
         
         # Create new pseudo-terminal for lsbio
         master_fd, slave_fd = pty.openpty()
-        
-        # Set up environment variables for lsbio
-        env = os.environ.copy()
-        
-        # Read API key from the toolbox api_key file
-        api_key_file = os.path.join(nlp_toolbox_dir, 'api_key')
-        if os.path.exists(api_key_file):
-            with open(api_key_file, 'r') as f:
-                content = f.read().strip()
-                # Extract the API key from the export statement
-                if content.startswith("export OPENAI_API_KEY="):
-                    api_key = content.split("'")[1] if "'" in content else content.split("=")[1].strip('"')
-                    env['OPENAI_API_KEY'] = api_key
-                else:
-                    env['OPENAI_API_KEY'] = content
-        
+        os.set_blocking(master_fd, False)
+        
+        # Reuse the environment prepared for the mkbio phase (API key
+        # already resolved) instead of rebuilding it from os.environ
+        env = terminal_info.get('env')
+        if env is None:
+            env = os.environ.copy()
+            api_key, _ = get_toolbox_api_key(nlp_toolbox_dir)
+            if api_key:
+                env['OPENAI_API_KEY'] = api_key
+
         # Start lsbio process
         process = subprocess.Popen(
             [system_python, lsbio_script, '-e'],
@@ -1154,7 +1727,7 @@ def run_lsbio_phase(session_id):
             stderr=slave_fd,
             cwd=nlp_toolbox_dir,
             env=env,
-            preexec_fn=os.setsid
+            start_new_session=True
         )
         
         # Close the slave fd in the parent process
@@ -1167,17 +1740,30 @@ def run_lsbio_phase(session_id):
         # Start reading from lsbio terminal
         def read_lsbio_terminal():
             try:
-                while process.poll() is None:
-                    ready, _, _ = select.select([master_fd], [], [], 0.1)
-                    if ready:
-                        try:
-                            data = os.read(master_fd, 1024).decode('utf-8', errors='ignore')
-                            if data:
-                                socketio.emit('terminal_output', {'data': data}, room=session_id)
-                        except OSError:
+                # Block in select until data or EOF; the exit check only
+                # runs on a 30 s quiet timeout instead of every tick
+                while True:
+                    ready, _, _ = select.select([master_fd], [], [], 30.0)
+                    if not ready:
+                        if process.poll() is not None:
                             break
-                
-                # lsbio finished
+                        continue
+                    data, eof = _read_pty_burst(master_fd)
+                    if data:
+                        socketio.emit('terminal_output', {'data': data}, room=session_id)
+                        info = active_terminals.get(session_id)
+                        if info:
+                            info['last_used'] = time.monotonic()
+                    if eof:
+                        break
+
+                # lsbio finished; give it a moment to be reaped so the
+                # returncode checks below see the real exit status
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    pass
+
                 if process.returncode == 0:
                     socketio.emit('terminal_output', {'data': '\r\nlsbio.py completed successfully.\r\n'}, room=session_id)
                     # Move jurors.yaml to temp directory
@@ -1187,7 +1773,7 @@ def run_lsbio_phase(session_id):
                     socketio.emit('terminal_output', {'data': '\r\nlsbio.py process terminated abnormally, but may have completed successfully. Checking output...\r\n'}, room=session_id)
                     
                     # Check if the YAML file was created successfully
-                    yaml_path = os.path.join(nlp_toolbox_dir, 'build', 'jurors.yaml')
+                    yaml_path = os.path.join(BUILD_DIR, 'jurors.yaml')
                     if os.path.exists(yaml_path):
                         socketio.emit('terminal_output', {'data': f'\r\nYAML file found at {yaml_path}, proceeding with execution.\r\n'}, room=session_id)
                         # Move jurors.yaml to temp directory
@@ -1200,7 +1786,7 @@ def run_lsbio_phase(session_id):
                 cleanup_terminal(session_id)
                     
             except Exception as e:
-                logger.error(f"Error reading lsbio terminal: {e}")
+                logger.error("Error reading lsbio terminal: %s", e)
                 socketio.emit('terminal_output', {'data': f'\r\nError reading lsbio terminal: {str(e)}\r\n'}, room=session_id)
                 cleanup_terminal(session_id)
         
@@ -1209,9 +1795,33 @@ def run_lsbio_phase(session_id):
         thread.start()
         
     except Exception as e:
-        logger.error(f"Error running lsbio phase: {e}")
+        logger.error("Error running lsbio phase: %s", e)
         socketio.emit('terminal_output', {'data': f'Error running lsbio: {str(e)}\r\n'}, room=session_id)
 
+def _find_yaml(nlp_toolbox_dir):
+    """Locate the generated jurors.yaml with a single scandir of build/.
+
+    Returns (path or None, names seen in build/) so callers get both the
+    existence decision and the debug listing from one directory read
+    instead of separate stat and listdir round trips.
+    """
+    build_dir = os.path.join(nlp_toolbox_dir, 'build')
+    build_files = []
+    try:
+        with os.scandir(build_dir) as entries:
+            for entry in entries:
+                build_files.append(entry.name)
+    except OSError:
+        pass
+    if 'jurors.yaml' in build_files:
+        return os.path.join(build_dir, 'jurors.yaml'), build_files
+    # Older toolbox versions wrote to the toolbox root
+    root_path = os.path.join(nlp_toolbox_dir, 'jurors.yaml')
+    if os.path.exists(root_path):
+        return root_path, build_files
+    return None, build_files
+
+
 def move_generated_file(session_id):
     """Move the generated jurors.yaml file to the temp directory"""
     try:
@@ -1222,23 +1832,13 @@ def move_generated_file(session_id):
         nlp_toolbox_dir = terminal_info['nlp_toolbox_dir']
         juror_count = terminal_info['juror_count']
         
-        # Check both possible locations for jurors.yaml
-        possible_locations = [
-            os.path.join(nlp_toolbox_dir, 'build', 'jurors.yaml'),  # build/ subdirectory
-            os.path.join(nlp_toolbox_dir, 'jurors.yaml')            # root directory
-        ]
-        
-        jurors_yaml_source = None
-        for location in possible_locations:
-            if os.path.exists(location):
-                jurors_yaml_source = location
-                logger.info(f"Found jurors.yaml at: {location}")
-                break
-        
+        jurors_yaml_source, build_files = _find_yaml(nlp_toolbox_dir)
+
         if jurors_yaml_source:
+            logger.info("Found jurors.yaml at: %s", jurors_yaml_source)
             filename = f"generated_jurors_{int(time.time())}.yaml"
             jurors_yaml_dest = os.path.join(JUROR_DIR, filename)
-            shutil.copy2(jurors_yaml_source, jurors_yaml_dest)
+            _fast_move(jurors_yaml_source, jurors_yaml_dest)
             
             # Store metadata for generated file (default to juror category with weight 100)
             store_file_metadata(filename, 'juror', 100, generated=True)
@@ -1246,36 +1846,61 @@ def move_generated_file(session_id):
             socketio.emit('terminal_output', {'data': f'Generated jurors saved as {filename}\r\n'}, room=session_id)
             socketio.emit('generation_completed', {'filename': filename, 'count': juror_count}, room=session_id)
         else:
-            # Debug: List files in both locations
-            logger.warning("jurors.yaml not found, checking directories...")
-            for check_dir in [nlp_toolbox_dir, os.path.join(nlp_toolbox_dir, 'build')]:
-                if os.path.exists(check_dir):
-                    try:
-                        files = os.listdir(check_dir)
-                        logger.info(f"Files in {check_dir}: {files}")
-                        socketio.emit('terminal_output', {'data': f'Files in {check_dir}: {files}\r\n'}, room=session_id)
-                    except Exception as e:
-                        logger.error(f"Error listing {check_dir}: {e}")
-            
-            socketio.emit('terminal_output', {'data': 'Warning: jurors.yaml not found after generation\r\n'}, room=session_id)
+            logger.warning("jurors.yaml not found; files in build/: %s", build_files)
+            socketio.emit('terminal_output', {'data': (f'Files in build directory: {build_files}\r\n'
+                                                       'Warning: jurors.yaml not found after generation\r\n')}, room=session_id)
             
     except Exception as e:
-        logger.error(f"Error moving generated file: {e}")
+        logger.error("Error moving generated file: %s", e)
         socketio.emit('terminal_output', {'data': f'Error saving generated file: {str(e)}\r\n'}, room=session_id)
 
+# Pending pty input per session: keystroke events are held for ~1 ms
+# and flushed with a single writev instead of one syscall per socket
+# event, which matters most for pastes
+_PENDING_INPUT = {}
+_PENDING_INPUT_MAX = 65536
+
+def _drain_terminal_input(session_id):
+    chunks = _PENDING_INPUT.pop(session_id, None)
+    if not chunks:
+        return
+    terminal_info = active_terminals.get(session_id)
+    if not terminal_info or 'master_fd' not in terminal_info:
+        return
+    try:
+        if hasattr(os, 'writev'):
+            os.writev(terminal_info['master_fd'], chunks)
+        else:
+            os.write(terminal_info['master_fd'], b''.join(chunks))
+    except OSError as e:
+        logger.error("Error draining terminal input: %s", e)
+
 @socketio.on('terminal_input')
 def handle_terminal_input(data):
     """Handle input from the user to the terminal"""
     try:
         session_id = request.sid
         terminal_info = active_terminals.get(session_id)
-        
+
         if terminal_info and 'master_fd' in terminal_info:
-            user_input = data.get('input', '')
-            os.write(terminal_info['master_fd'], user_input.encode('utf-8'))
-            
+            terminal_info['last_used'] = time.monotonic()
+            encoded = data.get('input', '').encode('utf-8')
+            if eventlet is None:
+                os.write(terminal_info['master_fd'], encoded)
+                return
+            # Coalesce bursts of input events (pastes arrive as many
+            # small frames) into one writev a millisecond later
+            pending = _PENDING_INPUT.get(session_id)
+            if pending is None:
+                _PENDING_INPUT[session_id] = [encoded]
+                eventlet.spawn_after(0.001, _drain_terminal_input, session_id)
+            else:
+                pending.append(encoded)
+                if sum(map(len, pending)) >= _PENDING_INPUT_MAX:
+                    _drain_terminal_input(session_id)
+
     except Exception as e:
-        logger.error(f"Error handling terminal input: {e}")
+        logger.error("Error handling terminal input: %s", e)
         emit('terminal_output', {'data': f'Error sending input: {str(e)}\r\n'})
 
 @socketio.on('disconnect')
@@ -1300,13 +1925,88 @@ def cleanup_terminal(session_id):
             except:
                 pass
     except Exception as e:
-        logger.error(f"Error cleaning up terminal: {e}")
+        logger.error("Error cleaning up terminal: %s", e)
 
-# Global storage for file metadata (in production, use a database or session storage)
+# Global storage for file metadata. With REDIS_HOST set (and the redis
+# package installed) entries live in Redis hashes, so they survive
+# restarts and are shared across workers; otherwise the in-process dict
+# is used, which matches the default single-worker deployment.
 FILE_METADATA = {}
+_META_PREFIX = 'filemeta:'
+_META_TTL = 86400  # a day; uploads are per-session, stale keys expire
+
+_redis = None
+if redis is not None and os.environ.get('REDIS_HOST'):
+    try:
+        _redis = redis.Redis(host=os.environ['REDIS_HOST'],
+                             port=int(os.environ.get('REDIS_PORT', 6379)),
+                             decode_responses=True)
+        _redis.ping()
+        logger.info("File metadata store: Redis at %s", os.environ['REDIS_HOST'])
+    except Exception as e:
+        logger.warning("Redis unavailable (%s); using in-process metadata store", e)
+        _redis = None
+
+_META_DEFAULT = {'category': 'juror', 'weight': 100, 'generated': False}
+
+# Bounded read cache in front of the Redis store so repeat lookups of
+# hot filenames skip the network round trip. Writes invalidate locally
+# and publish on a pubsub channel so other workers drop their copy too.
+_META_CACHE = {}
+_META_CACHE_MAX = 1024
+_META_INVALIDATE_CHANNEL = 'filemeta:invalidate'
+
+def _meta_cache_put(filename, meta):
+    while len(_META_CACHE) >= _META_CACHE_MAX:
+        _META_CACHE.pop(next(iter(_META_CACHE)), None)
+    _META_CACHE[filename] = meta
+
+def _meta_invalidate(filename=None):
+    """Drop a cached entry (all entries when filename is None) here and
+    in every other worker."""
+    if filename is None:
+        _META_CACHE.clear()
+    else:
+        _META_CACHE.pop(filename, None)
+    if _redis is not None:
+        try:
+            _redis.publish(_META_INVALIDATE_CHANNEL, filename or '*')
+        except Exception as e:
+            logger.warning("Metadata invalidation publish failed: %s", e)
+
+def _meta_invalidation_listener():
+    pubsub = _redis.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(_META_INVALIDATE_CHANNEL)
+    for message in pubsub.listen():
+        key = message.get('data')
+        if key == '*':
+            _META_CACHE.clear()
+        elif key:
+            _META_CACHE.pop(key, None)
+
+if _redis is not None:
+    threading.Thread(target=_meta_invalidation_listener, daemon=True).start()
+
+def _meta_from_hash(data):
+    """Convert a Redis hash (string fields) back to the dict shape the
+    callers expect."""
+    return {
+        'category': data.get('category', 'juror'),
+        'weight': int(data.get('weight', 100)),
+        'generated': bool(int(data.get('generated', 0)))
+    }
 
 def store_file_metadata(filename, category, weight, generated=False):
     """Store file metadata for later retrieval"""
+    if _redis is not None:
+        key = _META_PREFIX + filename
+        pipe = _redis.pipeline(transaction=False)
+        pipe.hset(key, mapping={'category': category, 'weight': weight,
+                                'generated': int(generated)})
+        pipe.expire(key, _META_TTL)
+        pipe.execute()
+        _meta_invalidate(filename)
+        return
     FILE_METADATA[filename] = {
         'category': category,
         'weight': weight,
@@ -1315,20 +2015,62 @@ def store_file_metadata(filename, category, weight, generated=False):
 
 def get_file_metadata(filename):
     """Get file metadata"""
+    if _redis is not None:
+        cached = _META_CACHE.get(filename)
+        if cached is not None:
+            return dict(cached)
+        data = _redis.hgetall(_META_PREFIX + filename)
+        if data:
+            meta = _meta_from_hash(data)
+            _meta_cache_put(filename, meta)
+            return dict(meta)
+        return dict(_META_DEFAULT)
     return FILE_METADATA.get(filename, {'category': 'juror', 'weight': 100, 'generated': False})
 
 def get_all_file_metadata():
     """Get all file metadata"""
+    if _redis is not None:
+        # One pipelined round trip for all hashes instead of an HGETALL
+        # RTT per file
+        keys = list(_redis.scan_iter(match=_META_PREFIX + '*', count=500))
+        if not keys:
+            return {}
+        pipe = _redis.pipeline(transaction=False)
+        for key in keys:
+            pipe.hgetall(key)
+        return {key[len(_META_PREFIX):]: _meta_from_hash(data)
+                for key, data in zip(keys, pipe.execute()) if data}
     return FILE_METADATA.copy()
 
 def clear_file_metadata():
     """Clear all file metadata"""
+    if _redis is not None:
+        keys = list(_redis.scan_iter(match=_META_PREFIX + '*', count=500))
+        if keys:
+            _redis.unlink(*keys)
+        _meta_invalidate()
+        return
     FILE_METADATA.clear()
 
+def prune_file_metadata(preserved):
+    """Drop metadata for every file not in *preserved*."""
+    if _redis is not None:
+        stale = [k for k in _redis.scan_iter(match=_META_PREFIX + '*', count=500)
+                 if k[len(_META_PREFIX):] not in preserved]
+        if stale:
+            _redis.unlink(*stale)
+            for key in stale:
+                _meta_invalidate(key[len(_META_PREFIX):])
+        return
+    # The dict-view set difference computes the stale keys in one
+    # C-level pass
+    for filename in FILE_METADATA.keys() - preserved:
+        del FILE_METADATA[filename]
+
 # Add startup logging for debugging
-logger.info(f"Flask app starting - Environment: {os.environ.get('FLASK_ENV', 'production')}")
-logger.info(f"Port: {PORT}, Host: {HOST}")
-logger.info(f"Debug mode: {DEBUG}")
+logger.info("Flask app starting - Environment: %s", os.environ.get('FLASK_ENV', 'production'))
+logger.info("Port: %s, Host: %s", PORT, HOST)
+logger.info("Debug mode: %s", DEBUG)
 
 # WSGI entry point for production servers like Gunicorn
 def create_app():
@@ -1341,18 +2083,15 @@ def create_app():
 application = app
 
 if __name__ == "__main__":
-    try:
-        # Use production-safe server settings
-        if DEBUG:
-            socketio.run(app, debug=True, port=PORT, host=HOST)
-        else:
-            # In production, use a proper WSGI server
-            socketio.run(app, debug=False, port=PORT, host=HOST)
-    finally:
-        # Cleanup temp directory on exit
-        if os.path.exists(TEMP_DIR):
-            shutil.rmtree(TEMP_DIR)
-            logger.info("Cleaned up temporary directory")
+    # Temp dir cleanup happens via the atexit hook registered at import,
+    # which also covers SIGINT and gunicorn shutdowns. The reloader is
+    # kept off even in debug mode: its forked child would create a
+    # second upload temp dir and leak the parent's on restart.
+    if DEBUG:
+        socketio.run(app, debug=True, use_reloader=False, port=PORT, host=HOST)
+    else:
+        # In production, use a proper WSGI server
+        socketio.run(app, debug=False, port=PORT, host=HOST)
 
 @app.route('/debug-files')
 def debug_files():
@@ -1411,6 +2150,44 @@ def debug_files():
     
     return jsonify(debug_info)
 
+def _read_preview(path, limit):
+    """Read a short text preview via raw byte reads, skipping the
+    TextIOWrapper and codec state a text-mode open allocates per call.
+    Reads twice the limit in bytes so multibyte truncation still yields
+    *limit* characters, then slices after one decode."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        raw = os.read(fd, limit * 2)
+    finally:
+        os.close(fd)
+    return raw.decode('utf-8', 'ignore')[:limit]
+
+@functools.lru_cache(maxsize=2)
+def _python_version_probe(executable):
+    """Run `python --version` once; the interpreter binary cannot
+    change while the container runs."""
+    return subprocess.run([executable, '--version'],
+                          capture_output=True, text=True, timeout=10)
+
+@functools.lru_cache(maxsize=4)
+def _mkbio_help_probe(script, mtime_ns):
+    """Run `mkbio.py --help`; keyed on the script's mtime so an edited
+    script re-probes and an unchanged one never forks again."""
+    return subprocess.run([SYSTEM_PYTHON, script, '--help'],
+                          cwd=NLP_TOOLBOX_DIR,
+                          capture_output=True, text=True, timeout=10)
+
+def _warm_debug_probes():
+    """Populate the probe caches off the request path so even the first
+    debug hit is served warm."""
+    try:
+        _python_version_probe(SYSTEM_PYTHON)
+        _mkbio_help_probe(MKBIO_SCRIPT, os.stat(MKBIO_SCRIPT).st_mtime_ns)
+    except Exception as e:
+        logger.debug("Debug probe warmup skipped: %s", e)
+
+threading.Thread(target=_warm_debug_probes, daemon=True).start()
+
 @app.route('/debug-nlp-toolbox')
 def debug_nlp_toolbox():
     """Debug endpoint to test NLPAgentsToolbox components"""
@@ -1423,11 +2200,11 @@ def debug_nlp_toolbox():
         'directory_structure': {}
     }
     
-    # Test Python executable
-    system_python = '/usr/local/bin/python3'
+    # Test Python executable (fork+exec+startup is ~100 ms, so the
+    # probes below come from warm caches)
+    system_python = SYSTEM_PYTHON
     try:
-        result = subprocess.run([system_python, '--version'], 
-                              capture_output=True, text=True, timeout=10)
+        result = _python_version_probe(system_python)
         debug_info['python_executable_test'] = {
             'executable': system_python,
             'exists': os.path.exists(system_python),
@@ -1439,10 +2216,10 @@ def debug_nlp_toolbox():
         debug_info['python_executable_test']['error'] = str(e)
     
     # Test mkbio script
-    backend_dir = os.path.join(os.path.dirname(__file__), 'backend')
-    nlp_toolbox_dir = os.path.join(backend_dir, 'NLPAgentsToolbox')
-    mkbio_script = os.path.join(nlp_toolbox_dir, 'tools', 'mkbio.py')
-    
+    backend_dir = BACKEND_DIR
+    nlp_toolbox_dir = NLP_TOOLBOX_DIR
+    mkbio_script = MKBIO_SCRIPT
+
     debug_info['mkbio_script_test'] = {
         'script_path': mkbio_script,
         'script_exists': os.path.exists(mkbio_script),
@@ -1452,8 +2229,10 @@ def debug_nlp_toolbox():
     
     if os.path.exists(mkbio_script):
         try:
+            # islice stops after ten lines instead of reading the whole
+            # file into a list first
             with open(mkbio_script, 'r') as f:
-                first_10_lines = ''.join(f.readlines()[:10])
+                first_10_lines = ''.join(islice(f, 10))
             debug_info['mkbio_script_test']['first_lines'] = first_10_lines
         except Exception as e:
             debug_info['mkbio_script_test']['read_error'] = str(e)
@@ -1503,13 +2282,8 @@ def debug_nlp_toolbox():
     
     # Test mkbio.py help command
     try:
-        mkbio_help = subprocess.run(
-            [system_python, mkbio_script, '--help'],
-            cwd=nlp_toolbox_dir,
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+        mkbio_help = _mkbio_help_probe(
+            mkbio_script, os.stat(mkbio_script).st_mtime_ns)
         debug_info['mkbio_help_test'] = {
             'return_code': mkbio_help.returncode,
             'stdout': mkbio_help.stdout[:500] + ('...' if len(mkbio_help.stdout) > 500 else ''),
@@ -1548,52 +2322,64 @@ def debug_temp_dirs():
                     jury_info = {
                         'name': jury_dir,
                         'path': jury_path,
-                        'exists': os.path.exists(jury_path),
-                        'is_directory': os.path.isdir(jury_path),
+                        'exists': False,
+                        'is_directory': False,
                         'contents': []
                     }
-                    
-                    if os.path.isdir(jury_path):
-                        jury_contents = os.listdir(jury_path)
-                        jury_info['contents'] = jury_contents
-                        
+
+                    # One scandir supplies names, types and sizes instead
+                    # of a listdir plus isfile/isdir/getsize per entry
+                    try:
+                        with os.scandir(jury_path) as it:
+                            entries = sorted(it, key=lambda e: e.name)
+                        jury_info['exists'] = True
+                        jury_info['is_directory'] = True
+                    except NotADirectoryError:
+                        jury_info['exists'] = True
+                        entries = None
+                    except FileNotFoundError:
+                        entries = None
+
+                    if entries is not None:
+                        jury_info['contents'] = [e.name for e in entries]
+
                         # Get details for each file/folder in jury directory
                         detailed_contents = []
-                        for item in jury_contents:
-                            item_path = os.path.join(jury_path, item)
+                        for entry in entries:
+                            item_path = entry.path
                             try:
+                                is_file = entry.is_file()
                                 item_info = {
-                                    'name': item,
+                                    'name': entry.name,
                                     'path': item_path,
-                                    'is_file': os.path.isfile(item_path),
-                                    'is_directory': os.path.isdir(item_path),
-                                    'size': os.path.getsize(item_path) if os.path.isfile(item_path) else None
+                                    'is_file': is_file,
+                                    'is_directory': entry.is_dir(),
+                                    'size': entry.stat().st_size if is_file else None
                                 }
-                                
+
                                 # If it's a file, try to read first few lines
-                                if os.path.isfile(item_path) and item_info['size'] and item_info['size'] < 10000:
+                                if is_file and item_info['size'] and item_info['size'] < 10000:
                                     try:
-                                        with open(item_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                            item_info['preview'] = f.read(500)  # First 500 chars
+                                        item_info['preview'] = _read_preview(item_path, 500)
                                     except Exception as e:
                                         item_info['preview_error'] = str(e)
-                                
+
                                 # If it's a directory, list its contents
-                                if os.path.isdir(item_path):
+                                if entry.is_dir():
                                     try:
                                         item_info['subdirectory_contents'] = os.listdir(item_path)
                                     except Exception as e:
                                         item_info['subdirectory_error'] = str(e)
-                                
+
                                 detailed_contents.append(item_info)
                             except Exception as e:
                                 detailed_contents.append({
-                                    'name': item,
+                                    'name': entry.name,
                                     'error': str(e)
                                 })
-                        
+
                         jury_info['detailed_contents'] = detailed_contents
-                    
+
                     debug_info['temp_directories'].append(jury_info)
                     
                 except Exception as e:
@@ -1609,17 +2395,66 @@ def debug_temp_dirs():
     
     return jsonify(debug_info)
 
+# Sensitive-name filter for the filesystem debug endpoints, compiled
+# once so each checked name is scanned in C instead of a Python-level
+# loop over the pattern list
+_SENSITIVE_PATTERNS = (
+    'api_key', 'secret', 'password', 'token', 'credential',
+    '.env', 'config', 'private', '.ssh', '.pem', '.key'
+)
+SENSITIVE_RE = re.compile('|'.join(map(re.escape, _SENSITIVE_PATTERNS)))
+
+# Short-TTL cache for /debug-filesystem listings: refreshes of the same
+# directory inside the window reuse the serialized payload instead of
+# redoing the stat/preview loop. Redis-backed when configured so
+# workers share entries; otherwise a small in-process dict.
+_FSDBG_TTL = 3  # seconds
+_FSDBG_CACHE = {}
+
+def _fsdbg_get(path):
+    if _redis is not None:
+        try:
+            return _redis.get('fsdbg:' + path)
+        except Exception:
+            return None
+    hit = _FSDBG_CACHE.get(path)
+    if hit and hit[0] > time.monotonic():
+        return hit[1]
+    _FSDBG_CACHE.pop(path, None)
+    return None
+
+def _fsdbg_set(path, payload):
+    if _redis is not None:
+        try:
+            _redis.set('fsdbg:' + path, payload, ex=_FSDBG_TTL)
+        except Exception:
+            pass
+        return
+    if len(_FSDBG_CACHE) > 64:
+        _FSDBG_CACHE.clear()
+    _FSDBG_CACHE[path] = (time.monotonic() + _FSDBG_TTL, payload)
+
 @app.route('/debug-filesystem')
 def debug_filesystem():
     """Debug endpoint to browse the filesystem structure (excludes sensitive files)"""
     path = request.args.get('path', '/tmp')
-    
-    # Security: Block access to sensitive paths
-    sensitive_patterns = [
-        'api_key', 'secret', 'password', 'token', 'credential',
-        '.env', 'config', 'private', '.ssh', '.pem', '.key'
-    ]
-    
+    normalized_path = os.path.normpath(path)
+
+    # Security gate first: a restricted path is rejected before any
+    # cache lookup or filesystem syscall happens on it
+    if SENSITIVE_RE.search(normalized_path.lower()):
+        return jsonify({
+            'requested_path': path,
+            'error': 'Access to sensitive files is restricted'
+        }), 403
+
+    # The HTML browser auto-refreshes hot directories; serve repeats of
+    # the same path from a short-TTL cache instead of redoing the whole
+    # stat/preview loop
+    cached = _fsdbg_get(normalized_path)
+    if cached is not None:
+        return Response(cached, mimetype='application/json')
+
     debug_info = {
         'timestamp': time.time(),
         'requested_path': path,
@@ -1632,13 +2467,6 @@ def debug_filesystem():
     }
     
     try:
-        # Normalize and validate path
-        normalized_path = os.path.normpath(path)
-        
-        # Security check: Don't allow access to sensitive file patterns
-        if any(pattern in normalized_path.lower() for pattern in sensitive_patterns):
-            debug_info['error'] = 'Access to sensitive files is restricted'
-            return jsonify(debug_info)
         debug_info['normalized_path'] = normalized_path
         
         # Check if path exists
@@ -1666,48 +2494,51 @@ def debug_filesystem():
             
             if debug_info['is_directory']:
                 try:
-                    items = os.listdir(normalized_path)
+                    # One scandir supplies names, types and stat results
+                    # instead of listdir plus isfile/isdir/stat per entry
+                    with os.scandir(normalized_path) as it:
+                        entries = list(it)
                     contents = []
-                    
+
                     # Filter out sensitive files
-                    filtered_items = []
-                    for item in items:
-                        if not any(pattern in item.lower() for pattern in sensitive_patterns):
-                            filtered_items.append(item)
+                    filtered_entries = []
+                    for entry in entries:
+                        if not SENSITIVE_RE.search(entry.name.lower()):
+                            filtered_entries.append(entry)
                         else:
                             # Log that we filtered out a sensitive file (for debugging)
-                            logger.info(f"Filtered sensitive file from debug browser: {item}")
-                    
-                    for item in sorted(filtered_items):
-                        item_path = os.path.join(normalized_path, item)
+                            logger.info("Filtered sensitive file from debug browser: %s", entry.name)
+
+                    for entry in sorted(filtered_entries, key=lambda e: e.name):
+                        item_path = entry.path
                         try:
-                            stat_info = os.stat(item_path)
+                            stat_info = entry.stat()
+                            is_file = entry.is_file()
                             item_info = {
-                                'name': item,
+                                'name': entry.name,
                                 'path': item_path,
-                                'is_file': os.path.isfile(item_path),
-                                'is_directory': os.path.isdir(item_path),
-                                'size': stat_info.st_size if os.path.isfile(item_path) else None,
+                                'is_file': is_file,
+                                'is_directory': entry.is_dir(),
+                                'size': stat_info.st_size if is_file else None,
                                 'modified': stat_info.st_mtime,
                                 'permissions': oct(stat_info.st_mode)[-3:]
                             }
-                            
+
                             # For small text files, provide a preview
-                            if (os.path.isfile(item_path) and 
-                                item_info['size'] and 
+                            if (is_file and
+                                item_info['size'] and
                                 item_info['size'] < 5000 and
-                                item.lower().endswith(('.txt', '.yaml', '.yml', '.json', '.py', '.md', '.log'))):
+                                entry.name.lower().endswith(('.txt', '.yaml', '.yml', '.json', '.py', '.md', '.log'))):
                                 try:
-                                    with open(item_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                        item_info['preview'] = f.read(1000)  # First 1000 chars
+                                    item_info['preview'] = _read_preview(item_path, 1000)
                                 except Exception as e:
                                     item_info['preview_error'] = str(e)
-                            
+
                             contents.append(item_info)
-                            
+
                         except Exception as e:
                             contents.append({
-                                'name': item,
+                                'name': entry.name,
                                 'path': item_path,
                                 'error': str(e)
                             })
@@ -1746,13 +2577,14 @@ def debug_filesystem():
             
     except Exception as e:
         debug_info['error'] = str(e)
-    
-    return jsonify(debug_info)
 
-@app.route('/debug-filesystem-browser')
-def debug_filesystem_browser():
-    """Web interface for browsing the filesystem"""
-    return """
+    payload = _json_bytes(debug_info)
+    _fsdbg_set(normalized_path, payload)
+    return Response(payload, mimetype='application/json')
+
+# The filesystem browser page never changes at runtime; encode it once
+# and let clients revalidate with an ETag instead of refetching 3 KB
+_BROWSER_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -1876,4 +2708,15 @@ def debug_filesystem_browser():
         </script>
     </body>
     </html>
-    """
\ No newline at end of file
+""".encode()
+_BROWSER_ETAG = '"%s"' % hashlib.blake2b(_BROWSER_HTML, digest_size=8).hexdigest()
+
+@app.route('/debug-filesystem-browser')
+def debug_filesystem_browser():
+    """Web interface for browsing the filesystem"""
+    if request.headers.get('If-None-Match') == _BROWSER_ETAG:
+        return Response(status=304)
+    return Response(_BROWSER_HTML, mimetype='text/html', headers={
+        'Cache-Control': 'public, max-age=3600',
+        'ETag': _BROWSER_ETAG
+    })
\ No newline at end of file
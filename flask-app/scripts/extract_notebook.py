@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Extract Python code from the deliberation notebook at container build time.
+
+Writes backend/run_notebook_functions.py so the first /run_notebook request
+doesn't pay the notebook JSON parse. The Flask app re-extracts at runtime
+only if the notebook changes or this output is missing (dev mode).
+"""
+import json
+import os
+import py_compile
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(os.path.dirname(HERE), 'backend')
+NOTEBOOK_PATH = os.path.join(BACKEND_DIR, 'langgraph_jury_deliberation.ipynb')
+OUTPUT_PATH = os.path.join(BACKEND_DIR, 'run_notebook_functions.py')
+
+
+# Lines to drop from notebook cells: shell commands and blanks
+SKIP_LINE = re.compile(r'^\s*(?:!.*)?$')
+
+
+def extract(notebook_path, output_path):
+    """Extract code cells from the notebook, dropping shell commands."""
+    with open(notebook_path, 'rb') as f:
+        raw = f.read()
+    notebook = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+    python_code = []
+    for cell in notebook['cells']:
+        if cell['cell_type'] == 'code':
+            cell_source = ''.join(cell['source'])
+            # Skip shell commands (starting with !) and empty lines
+            filtered_lines = [line for line in cell_source.split('\n')
+                              if not SKIP_LINE.match(line)]
+            if filtered_lines:  # Only add if there's actual Python code
+                python_code.append('\n'.join(filtered_lines))
+
+    with open(output_path, 'w') as f:
+        f.write('\n\n'.join(python_code))
+
+    # Precompile so the runner's import loads cached bytecode
+    py_compile.compile(output_path, doraise=True)
+
+
+if __name__ == '__main__':
+    extract(NOTEBOOK_PATH, OUTPUT_PATH)
+    print(f"Extracted notebook functions to {OUTPUT_PATH}")